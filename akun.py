@@ -0,0 +1,213 @@
+import argparse
+import base64
+import csv
+import hashlib
+import hmac
+import os
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Akun Pengguna ---
+# Password disimpan sebagai hash scrypt (hashlib, tanpa dependensi tambahan)
+# dengan parameter di dalam string hash:
+#
+#   scrypt$<n>$<r>$<p>$<salt base64>$<hash base64>
+#
+# Mengubah AKUN_SCRYPT_N hanya berlaku untuk hash baru; hash lama tetap bisa
+# diverifikasi dan diperbarui otomatis saat login berikutnya (perlu_rehash).
+#
+#   python akun.py provisi akun.csv --keluar kredensial.csv
+#   python akun.py provisi --dari-karyawan --keluar kredensial.csv
+#   python akun.py passwd admin
+#   python akun.py nonaktif karyawan1
+
+SCRYPT_N = int(os.environ.get("AKUN_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = 8
+SCRYPT_P = 1
+PANJANG_HASH = 32
+
+ROLE = ("Admin", "Karyawan")
+
+# Lama sesi login tanpa aktivitas, dalam detik.
+SESI_TTL = int(os.environ.get("SESI_TTL_JAM", "12")) * 3600
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=PANJANG_HASH)
+
+
+def hash_password(password, n=None):
+    n = n or SCRYPT_N
+    salt = secrets.token_bytes(16)
+    return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(_scrypt(password, salt, n, SCRYPT_R, SCRYPT_P))}"
+
+
+def cek_password(password, hash_tersimpan):
+    try:
+        skema, n, r, p, salt, hasil = hash_tersimpan.split("$")
+    except (AttributeError, ValueError):
+        return False
+    if skema != "scrypt":
+        return False
+    hitung = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+    return hmac.compare_digest(hitung, base64.b64decode(hasil))
+
+
+def perlu_rehash(hash_tersimpan):
+    return not hash_tersimpan.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+
+# Dipakai untuk username yang tidak ada, agar waktu respons login tidak
+# membocorkan username mana yang terdaftar.
+_HASH_DUMMY = None
+
+
+def hash_dummy():
+    global _HASH_DUMMY
+    if _HASH_DUMMY is None:
+        _HASH_DUMMY = hash_password(secrets.token_urlsafe(16))
+    return _HASH_DUMMY
+
+
+# --- Tabel users ---
+
+SQL_SIMPAN_USER = ("INSERT INTO users (username, password_hash, role, karyawan_id) VALUES (?, ?, ?, ?) "
+                   "ON CONFLICT(username) DO UPDATE SET password_hash = excluded.password_hash, "
+                   "role = excluded.role, karyawan_id = excluded.karyawan_id, aktif = 1, "
+                   "generasi = users.generasi + 1")
+
+
+# --- Provisioning Massal ---
+# Hash scrypt dihitung paralel di thread pool (hashlib melepas GIL selama
+# scrypt), lalu semua akun ditulis dalam satu transaksi. n yang lebih kecil
+# mempercepat batch besar; hash tersebut dinaikkan ke SCRYPT_N saat pemilik
+# akun pertama kali login.
+
+def hash_massal(akun, workers=None, n=None):
+    # akun: list dict username, password, role, karyawan_id. Password kosong
+    # diganti password acak. Mengembalikan (rows siap insert, kredensial).
+    for a in akun:
+        if a["role"] not in ROLE:
+            raise ValueError(f"Role tidak dikenal untuk {a['username']}: {a['role']}")
+        a["password"] = a.get("password") or secrets.token_urlsafe(9)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        hashes = list(pool.map(lambda a: hash_password(a["password"], n), akun, chunksize=16))
+    rows = [(a["username"], h, a["role"], a.get("karyawan_id")) for a, h in zip(akun, hashes)]
+    kredensial = [(a["username"], a["password"], a["role"]) for a in akun]
+    return rows, kredensial
+
+
+def baca_csv(path):
+    # Kolom: username, password (boleh kosong), role, karyawan_id (boleh kosong).
+    with open(path, newline="", encoding="utf-8") as f:
+        return [{"username": r["username"].strip(), "password": (r.get("password") or "").strip(),
+                 "role": (r.get("role") or "Karyawan").strip(),
+                 "karyawan_id": int(r["karyawan_id"]) if (r.get("karyawan_id") or "").strip() else None}
+                for r in csv.DictReader(f) if r.get("username", "").strip()]
+
+
+# --- Penyimpanan Sesi ---
+# Login memverifikasi password sekali (scrypt sengaja mahal); rerun berikutnya
+# cukup mencocokkan token sesi di memori proses. Token menyimpan users.generasi
+# saat login. Ganti password atau nonaktif (bisa dari proses lain, mis. CLI
+# ini) menaikkan generasi di database, dan absen.py menolak sesi yang
+# generasinya tidak lagi sama dengan akun.
+
+class SesiStore:
+    def __init__(self, ttl=SESI_TTL):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def buat(self, username, generasi):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._data[token] = (username, generasi, time.monotonic() + self.ttl)
+        return token
+
+    def ambil(self, token):
+        # (username, generasi) pemilik token, atau None jika tidak ada/kedaluwarsa.
+        sekarang = time.monotonic()
+        with self._lock:
+            isi = self._data.get(token)
+            if isi is None:
+                return None
+            if isi[2] < sekarang:
+                del self._data[token]
+                return None
+            self._data[token] = (isi[0], isi[1], sekarang + self.ttl)
+            return isi[0], isi[1]
+
+    def hapus(self, token):
+        with self._lock:
+            self._data.pop(token, None)
+
+
+sesi = SesiStore()
+
+
+def main(argv=None):
+    import getpass
+
+    import repository as repo
+
+    parser = argparse.ArgumentParser(prog="akun.py")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    provisi = sub.add_parser("provisi", help="buat/perbarui banyak akun sekaligus")
+    provisi.add_argument("file", nargs="?", help="CSV: username,password,role,karyawan_id")
+    provisi.add_argument("--dari-karyawan", action="store_true",
+                         help="satu akun Karyawan (username = ID) untuk tiap karyawan yang belum punya akun")
+    provisi.add_argument("--keluar", help="tulis kredensial (termasuk password acak) ke CSV ini")
+    provisi.add_argument("--workers", type=int, help="jumlah thread hashing")
+    provisi.add_argument("--n", type=int, help=f"biaya scrypt untuk batch ini (bawaan {SCRYPT_N})")
+    passwd = sub.add_parser("passwd", help="ganti password satu akun")
+    passwd.add_argument("username")
+    nonaktif = sub.add_parser("nonaktif", help="nonaktifkan satu akun dan akhiri sesinya")
+    nonaktif.add_argument("username")
+    args = parser.parse_args(argv)
+
+    repo.init_db()
+    if args.perintah == "passwd":
+        password = getpass.getpass("Password baru: ")
+        if not repo.ganti_password(args.username, password):
+            print(f"Akun {args.username} tidak ditemukan.")
+            return 1
+        print("Password diperbarui.")
+        return 0
+    if args.perintah == "nonaktif":
+        if not repo.nonaktifkan_user(args.username):
+            print(f"Akun {args.username} tidak ditemukan.")
+            return 1
+        print("Akun dinonaktifkan.")
+        return 0
+
+    if args.dari_karyawan:
+        akun = [{"username": str(k), "password": "", "role": "Karyawan", "karyawan_id": k}
+                for k in repo.karyawan_tanpa_akun()]
+    elif args.file:
+        akun = baca_csv(args.file)
+    else:
+        parser.error("isi file CSV atau --dari-karyawan")
+    t0 = time.perf_counter()
+    rows, kredensial = hash_massal(akun, args.workers, args.n)
+    repo.simpan_users(rows)
+    print(f"{len(rows)} akun disimpan ({time.perf_counter() - t0:.1f} s)")
+    if args.keluar:
+        with open(args.keluar, "w", newline="", encoding="utf-8") as f:
+            tulis = csv.writer(f)
+            tulis.writerow(["username", "password", "role"])
+            tulis.writerows(kredensial)
+        print(f"Kredensial ditulis ke {args.keluar}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# Benchmark jalur data halaman absen.py tanpa Streamlit: Dashboard, Data
+# Absensi, Kalender Absensi, impor Excel dan Accept izin. Skenario halaman
+# memanggil fungsi jalur data di modul halaman itu sendiri (yang juga dipakai
+# tampilkan()), jadi hanya bagian render Streamlit yang tidak ikut terukur.
+# Impor dan Accept dikirim sebagai job seperti dari halaman.
+#
+#   python -m benchmarks.data_sintetis --keluar /tmp/bench.db --karyawan 10000 --tahun 2022 2024
+#   python -m benchmarks.bench_halaman --db /tmp/bench.db --json hasil.json
+#   python -m benchmarks.bench_halaman --db /tmp/bench.db --banding hasil.json
+#
+# Database sumber disalin ke direktori sementara sehingga skenario yang menulis
+# (impor, Accept) tidak mengubahnya dan setiap run mulai dari data yang sama.
+# Tanpa --db, database sintetis dibuat dulu (--karyawan, --tahun).
+#
+# Secara bawaan cache query dikosongkan sebelum setiap pengulangan (halaman
+# pertama kali dibuka setelah ada penulisan); --cache mengukur rerun dengan
+# cache hangat. Setiap skenario diawali satu putaran pemanasan yang tidak
+# diukur. Memori puncak diukur dengan tracemalloc pada satu pengulangan
+# tambahan, terpisah dari pengukuran waktu.
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import cache
+import jobs
+import repository as repo
+from benchmarks import data_sintetis
+from benchmarks.bench_impor import buat_workbook
+from halaman import dashboard, data_absensi, kalender
+
+PERSENTIL = (50, 90, 95, 99)
+TOLERANSI = 0.10
+
+
+# --- Skenario (jalur data tiap halaman, dengan pilihan bawaan halaman) ---
+
+def halaman_pertama(total):
+    # Pengganti pilih_halaman: halaman 1, 25 baris.
+    return 25, 0
+
+
+def halaman_dashboard():
+    dashboard.grafik_jenis()
+    return dashboard.data_pending(halaman_pertama, repo.load_thumbnail)[0]
+
+
+def halaman_data_absensi(tahun, bulan):
+    bulan_ini = data_absensi.data_bulan(tahun, bulan)
+    total, page_df = data_absensi.data_tabel(data_absensi.filter_absensi(bulan_ini["awal"], bulan_ini["akhir"]),
+                                             halaman_pertama)
+    if page_df is not None:
+        data_absensi.highlight_telat(page_df)
+    return total
+
+
+def halaman_kalender(tahun, bulan, tanggal):
+    kalender.event_bulan(tahun, bulan)
+    karyawan_hadir, df_absent = kalender.rincian_tanggal(tanggal)
+    return len(karyawan_hadir), len(df_absent)
+
+
+def jalankan_job(jenis, parameter, data=None):
+    # Dikerjakan langsung di thread ini, bukan oleh worker latar belakang.
+    job_id = jobs.kirim(jenis, parameter, data=data)
+    jobs.jalankan(job_id)
+    job = jobs.ambil(job_id)
+    if job["status"] != jobs.STATUS_SELESAI:
+        raise RuntimeError(f"Job {jenis} gagal: {job['pesan']}")
+
+
+def impor_excel(xlsx, tahun, bulan, streaming):
+    jalankan_job("impor_absensi", {"tahun": tahun, "bulan": bulan, "nama_file": "bench.xlsx",
+                                   "ganti": True, "streaming": streaming}, data=xlsx)
+
+
+def accept(pending):
+    jalankan_job("terima_izin", {"izin_id": pending.pop()})
+
+
+# --- Pengukuran ---
+
+def kosongkan_cache():
+    cache.query_cache.clear()
+    repo._indeks_izin = (None, None)
+
+
+def ukur(fn, repeat, pakai_cache):
+    # Satu putaran pemanasan (import lazy, statement cache sqlite) tidak diukur.
+    fn()
+    waktu = []
+    for _ in range(repeat):
+        if not pakai_cache:
+            kosongkan_cache()
+        t0 = time.perf_counter()
+        fn()
+        waktu.append((time.perf_counter() - t0) * 1000)
+    if not pakai_cache:
+        kosongkan_cache()
+    tracemalloc.start()
+    fn()
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    hasil = {"n": repeat, "min_ms": min(waktu), "rata_ms": float(np.mean(waktu)), "maks_ms": max(waktu)}
+    hasil.update({f"p{p}_ms": float(np.percentile(waktu, p)) for p in PERSENTIL})
+    hasil["memori_puncak_mb"] = puncak / 1024 / 1024
+    return hasil
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def info_data(path):
+    conn = sqlite3.connect(path)
+    try:
+        jumlah = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                  for t in ("karyawan", "izin", "absensi", "lampiran")}
+        jumlah["pending"] = conn.execute("SELECT COUNT(*) FROM izin WHERE status = 'Pending'").fetchone()[0]
+        # Baris Izin bisa melewati akhir tahun data; tahun terakhir diambil dari presensi.
+        jumlah["tahun_terakhir"] = int(conn.execute(
+            "SELECT MAX(substr(tanggal, 1, 4)) FROM absensi WHERE status IS NOT 'Izin'").fetchone()[0])
+    finally:
+        conn.close()
+    jumlah["ukuran_mb"] = round(os.path.getsize(path) / 1024 / 1024, 1)
+    return jumlah
+
+
+def banding(hasil, path, toleransi):
+    # Bandingkan p50/p95 dengan run sebelumnya; True jika ada regresi.
+    with open(path, encoding="utf-8") as f:
+        dasar = json.load(f)["hasil"]
+    regresi = False
+    print(f"\n{'skenario':<16}{'p50 dasar':>12}{'p50 kini':>12}{'rasio':>8}{'p95 dasar':>12}{'p95 kini':>12}{'rasio':>8}")
+    for nama, kini in hasil.items():
+        if nama not in dasar:
+            continue
+        r50 = kini["p50_ms"] / dasar[nama]["p50_ms"]
+        r95 = kini["p95_ms"] / dasar[nama]["p95_ms"]
+        tanda = "  REGRESI" if max(r50, r95) > 1 + toleransi else ""
+        regresi = regresi or bool(tanda)
+        print(f"{nama:<16}{dasar[nama]['p50_ms']:>12.1f}{kini['p50_ms']:>12.1f}{r50:>7.2f}x"
+              f"{dasar[nama]['p95_ms']:>12.1f}{kini['p95_ms']:>12.1f}{r95:>7.2f}x{tanda}")
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", help="database sumber (lihat benchmarks.data_sintetis)")
+    parser.add_argument("--karyawan", type=int, default=1000, help="skala data sintetis jika --db tidak diisi")
+    parser.add_argument("--tahun", type=int, nargs=2, default=[2024, 2024], metavar=("AWAL", "AKHIR"))
+    parser.add_argument("--repeat", type=int, default=20, help="pengulangan skenario baca dan Accept")
+    parser.add_argument("--repeat-impor", type=int, default=3)
+    parser.add_argument("--streaming", action="store_true", help="impor dengan mode streaming")
+    parser.add_argument("--cache", action="store_true", help="ukur dengan cache query hangat")
+    parser.add_argument("--skenario", nargs="+", help="hanya jalankan skenario ini")
+    parser.add_argument("--json", help="tulis hasil ke file JSON ini")
+    parser.add_argument("--banding", help="bandingkan dengan hasil JSON sebelumnya")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI, help="batas kenaikan p50/p95 (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        if args.db:
+            shutil.copyfile(args.db, path)
+        else:
+            data_sintetis.buat(path, args.karyawan, args.tahun[0], args.tahun[1], log=lambda _: None)
+        repo.DB_PATH = path
+        repo.init_db()
+        data = info_data(path)
+        print(f"Data: {data['karyawan']} karyawan, {data['absensi']} absensi, {data['izin']} izin "
+              f"({data['pending']} pending), {data['ukuran_mb']} MB ({time.perf_counter() - t0:.1f} s)")
+
+        tahun, bulan = data["tahun_terakhir"], 6
+        tanggal = f"{tahun}-{bulan:02d}-14"
+        with repo.koneksi() as conn:
+            isi_bulan = conn.execute("SELECT COUNT(*) FROM absensi WHERE tanggal BETWEEN ? AND ?",
+                                     (f"{tahun}-{bulan:02d}-01", f"{tahun}-{bulan:02d}-31")).fetchone()[0]
+            if not isi_bulan:
+                raise SystemExit(f"Tidak ada absensi pada {tahun}-{bulan:02d}; skenario data_absensi "
+                                 "dan kalender akan mengukur bulan kosong.")
+            pending = [r[0] for r in conn.execute("SELECT id FROM izin WHERE status = 'Pending' ORDER BY id DESC")]
+        buf = io.BytesIO()
+        buat_workbook(data["karyawan"], hari=30).to_excel(buf, index=False)
+        xlsx = buf.getvalue()
+
+        skenario = {
+            "dashboard": (halaman_dashboard, args.repeat),
+            "data_absensi": (lambda: halaman_data_absensi(tahun, bulan), args.repeat),
+            "kalender": (lambda: halaman_kalender(tahun, bulan, tanggal), args.repeat),
+            "impor_excel": (lambda: impor_excel(xlsx, tahun, bulan, args.streaming), args.repeat_impor),
+            "accept": (lambda: accept(pending), min(args.repeat, len(pending) - 2)),
+        }
+        hasil = {}
+        for nama, (fn, repeat) in skenario.items():
+            if args.skenario and nama not in args.skenario:
+                continue
+            if repeat < 1:
+                print(f"{nama}: dilewati, izin Pending tidak cukup")
+                continue
+            hasil[nama] = ukur(fn, repeat, args.cache)
+        repo.get_pool(path).close()
+
+    print(f"\n{'skenario':<16}{'n':>4}" + "".join(f"{f'p{p} (ms)':>11}" for p in PERSENTIL) + f"{'maks (ms)':>11}{'memori (MB)':>13}")
+    for nama, h in hasil.items():
+        print(f"{nama:<16}{h['n']:>4}" + "".join(f"{h[f'p{p}_ms']:>11.1f}" for p in PERSENTIL)
+              + f"{h['maks_ms']:>11.1f}{h['memori_puncak_mb']:>13.1f}")
+
+    if args.json:
+        meta = {"waktu": datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+                "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                "pandas": pd.__version__, "platform": platform.platform(), "cpu": os.cpu_count(),
+                "data": data, "cache": args.cache, "streaming": args.streaming}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "hasil": hasil}, f, indent=2)
+        print(f"\nHasil ditulis ke {args.json}")
+    if args.banding and banding(hasil, args.banding, args.toleransi):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Benchmark impor presensi bulanan: pipeline lama (apply/iterrows) vs pipeline
+# vectorized di presensi.py.
+#
+#   python -m benchmarks.bench_impor --karyawan 10000
+#   python -m benchmarks.bench_impor --karyawan 10000 --xlsx   # termasuk baca Excel
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import migrations
+import presensi
+import repository as repo
+
+
+def buat_workbook(karyawan, hari=31, seed=42):
+    # Format ekspor mesin absensi: dua baris (datang, pulang) per karyawan.
+    rng = np.random.default_rng(seed)
+    ids = np.repeat(np.arange(1, karyawan + 1), 2)
+    data = {
+        "ID": ids,
+        "Nama": [f"KARYAWAN {i}" for i in ids],
+        "Jenis": np.tile(["Datang", "Pulang"], karyawan),
+    }
+    for d in range(1, hari + 1):
+        datang = rng.integers(7 * 60 + 30, 9 * 60 + 45, karyawan)
+        pulang = rng.integers(16 * 60 + 30, 19 * 60, karyawan)
+        menit = np.column_stack([datang, pulang]).ravel()
+        kolom = pd.Series([f"{m // 60:02d}:{m % 60:02d}" for m in menit], dtype=object)
+        kolom[rng.random(len(kolom)) < 0.05] = None
+        data[d] = kolom.values
+    return pd.DataFrame(data)
+
+
+# --- Pipeline lama (salinan kode sebelum vectorized) ---
+
+def cek_ketepatan_waktu(waktu_masuk):
+    try:
+        waktu_batas = datetime.strptime("09:17", "%H:%M").time()
+        if isinstance(waktu_masuk, str):
+            waktu_masuk_obj = datetime.strptime(waktu_masuk.strip(), "%H:%M").time()
+        elif isinstance(waktu_masuk, (datetime, pd.Timestamp)):
+            waktu_masuk_obj = waktu_masuk.time()
+        else:
+            return "Invalid Time"
+        return "Telat" if waktu_masuk_obj > waktu_batas else "Tepat Waktu"
+    except Exception:
+        return "Invalid Time"
+
+
+def format_lama(df, conn):
+    df["Jenis"] = df["Jenis"].str.lower()
+    day_cols = [col for col in df.columns if str(col).isdigit()]
+    df_long = df.melt(id_vars=['ID', 'Nama', 'Jenis'], value_vars=day_cols, var_name='tanggal', value_name='waktu')
+    df_long = df_long.dropna(subset=['waktu'])
+    df_pivot = df_long.pivot_table(index=['ID', 'Nama', 'tanggal'], columns='Jenis', values='waktu',
+                                   aggfunc='first').reset_index()
+    df_pivot['status'] = df_pivot['datang'].apply(lambda x: cek_ketepatan_waktu(x) if x != "" else "No Data")
+    df_final = df_pivot[['ID', 'Nama', 'tanggal', 'status', 'datang', 'pulang']].copy()
+    df_final.rename(columns={'ID': 'id'}, inplace=True)
+    mapping = pd.read_sql_query("SELECT ID, Divisi FROM karyawan", conn).set_index("ID")["Divisi"].to_dict()
+    df_final['divisi'] = df_final['id'].apply(lambda x: mapping.get(x, "No Data"))
+    return df_final
+
+
+def impor_lama(df, conn, tahun, bulan):
+    df_proc = format_lama(df, conn)
+    df_proc['tanggal'] = df_proc['tanggal'].apply(lambda d: f"{tahun}-{bulan:02d}-{int(d):02d}")
+    df_proc.rename(columns={"Nama": "nama", "datang": "jam_masuk", "pulang": "jam_keluar"}, inplace=True)
+    for _, row in df_proc.iterrows():
+        conn.execute("INSERT INTO absensi (nama, divisi, tanggal, jam_masuk, jam_keluar, status) VALUES (?, ?, ?, ?, ?, ?)",
+                     (row['nama'], row['divisi'], row['tanggal'], row['jam_masuk'], row['jam_keluar'], row['status']))
+    conn.commit()
+    return df_proc
+
+
+def impor_baru(df, conn, tahun, bulan):
+    mapping = pd.read_sql_query("SELECT ID, Divisi FROM karyawan", conn).set_index("ID")["Divisi"].to_dict()
+    df_proc = presensi.format_presensi_data(df, mapping)
+    # Jalur simpan yang sama dengan aplikasi: upsert + ringkasan + rekap bulanan.
+    repo.save_absensi(presensi.ke_baris_absensi(df_proc, tahun, bulan))
+    return df_proc
+
+
+def db_baru(tmp, nama, karyawan):
+    conn = sqlite3.connect(os.path.join(tmp, nama))
+    migrations.migrate(conn)
+    conn.executemany("INSERT INTO karyawan (ID, Nama, Divisi) VALUES (?, ?, ?)",
+                     ((i, f"KARYAWAN {i}", f"Divisi {i % 12}") for i in range(1, karyawan + 1)))
+    conn.commit()
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--karyawan", type=int, default=10_000)
+    parser.add_argument("--xlsx", action="store_true", help="tulis lalu baca workbook .xlsx sungguhan")
+    args = parser.parse_args()
+
+    df = buat_workbook(args.karyawan)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.xlsx:
+            path = os.path.join(tmp, "presensi.xlsx")
+            df.to_excel(path, index=False)
+            t0 = time.perf_counter()
+            df = pd.read_excel(path)
+            print(f"Baca Excel: {time.perf_counter() - t0:.2f} s")
+
+        hasil = {}
+        for nama, fn in (("lama", impor_lama), ("baru", impor_baru)):
+            conn = db_baru(tmp, f"{nama}.db", args.karyawan)
+            repo.DB_PATH = os.path.join(tmp, f"{nama}.db")
+            t0 = time.perf_counter()
+            df_proc = fn(df.copy(), conn, 2024, 5)
+            hasil[nama] = (time.perf_counter() - t0, df_proc)
+            conn.close()
+            repo.get_pool().close()
+
+    lama, baru = hasil["lama"][1], hasil["baru"][1]
+    baru = baru.assign(tanggal=[r[2] for r in presensi.ke_baris_absensi(baru, 2024, 5)])
+    gabung = lama.merge(baru, on=["id", "tanggal"], suffixes=("_lama", "_baru"))
+    berbeda = (gabung["status_lama"] != gabung["status_baru"]) & gabung["jam_masuk"].notna()
+    print(f"{args.karyawan} karyawan, {len(baru)} baris absensi")
+    print(f"pipeline lama : {hasil['lama'][0]:.2f} s")
+    print(f"pipeline baru : {hasil['baru'][0]:.2f} s ({hasil['lama'][0] / hasil['baru'][0]:.1f}x)")
+    print(f"status berbeda (di luar baris tanpa jam datang): {int(berbeda.sum())}")
+
+
+if __name__ == "__main__":
+    main()
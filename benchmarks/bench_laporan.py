@@ -0,0 +1,124 @@
+# Benchmark laporan bulanan: rekap dihitung langsung dari absensi/izin mentah
+# dibandingkan dengan membaca tabel rekap_bulanan (migrasi 8).
+#
+#   python -m benchmarks.bench_laporan --karyawan 5000
+#
+# Data sintetis: satu tahun absensi hari kerja untuk setiap karyawan, plus izin
+# acak (sebagian melewati batas bulan). Karyawan ada di tabel karyawan, jadi
+# migrasi 11 mengisi karyawan_id dan rekap dikelompokkan per id.
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+import laporan
+import migrations
+import ringkasan
+
+JENIS = ["Cuti", "Telat", "Sakit", "WFH"]
+TAHUN = 2024
+
+
+def isi_data(conn, karyawan, izin_per_karyawan, seed=42):
+    rnd = random.Random(seed)
+    awal = date(TAHUN, 1, 1)
+    hari_kerja = [d for d in (awal + timedelta(days=i) for i in range(366)) if d.year == TAHUN and d.weekday() < 5]
+
+    def absensi():
+        for d in hari_kerja:
+            tanggal = d.isoformat()
+            for k in range(karyawan):
+                menit = 7 * 60 + 30 + rnd.randint(0, 120)
+                status = "Telat" if menit > 9 * 60 + 17 else "Tepat Waktu"
+                yield (f"KARYAWAN {k}", f"Divisi {k % 25}", tanggal, f"{menit // 60:02d}:{menit % 60:02d}", "17:00", status)
+
+    def izin():
+        for k in range(karyawan):
+            for _ in range(izin_per_karyawan):
+                mulai = rnd.choice(hari_kerja)
+                jumlah = rnd.randint(1, 5)
+                yield (f"KARYAWAN {k}", f"Divisi {k % 25}", rnd.choice(JENIS), mulai.isoformat(), mulai.isoformat(),
+                       jumlah, (mulai + timedelta(days=jumlah - 1)).isoformat(), ringkasan.STATUS_DITERIMA)
+
+    conn.executemany("INSERT INTO karyawan (ID, Nama, Divisi) VALUES (?, ?, ?)",
+                     [(k, f"KARYAWAN {k}", f"Divisi {k % 25}") for k in range(karyawan)])
+    conn.executemany("INSERT INTO absensi (nama, divisi, tanggal, jam_masuk, jam_keluar, status) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", absensi())
+    conn.executemany("INSERT INTO izin (nama, divisi, jenis_pengajuan, tanggal_pengajuan, tanggal_izin, "
+                     "jumlah_hari, tanggal_selesai, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", izin())
+    conn.commit()
+
+
+def ukur(fn, repeat):
+    hasil = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        hasil.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(hasil)
+
+
+def rekap_mentah(conn):
+    # Tanpa tabel rekap: query rekap dijalankan untuk setiap bulan pada saat dibaca.
+    rows = []
+    for bln in range(1, 13):
+        bulan = f"{TAHUN}-{bln:02d}"
+        awal, akhir = laporan.batas_bulan(bulan)
+        rows += conn.execute(laporan.SQL_REKAP, {"bulan": bulan, "awal": awal, "akhir": akhir, "karyawan_id": None,
+                                                 "nama": None, "diterima": ringkasan.STATUS_DITERIMA}).fetchall()
+    return rows
+
+
+def rollup(conn, per_divisi, per_bulan):
+    return lambda: conn.execute(laporan.sql_rollup(per_divisi, per_bulan), (f"{TAHUN}-01", f"{TAHUN}-12")).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--karyawan", type=int, default=5000)
+    parser.add_argument("--izin", type=int, default=4, help="izin diterima per karyawan")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        # Data dimuat pada versi 7 agar migrasi 8 ikut terukur sebagai rebuild awal.
+        for migrasi in migrations.MIGRATIONS[:7]:
+            migrasi(conn)
+        conn.execute("PRAGMA user_version = 7")
+        conn.commit()
+        t0 = time.perf_counter()
+        isi_data(conn, args.karyawan, args.izin)
+        jumlah = conn.execute("SELECT COUNT(*) FROM absensi").fetchone()[0]
+        print(f"Data sintetis: {args.karyawan} karyawan, {jumlah} absensi ({time.perf_counter() - t0:.1f} s)")
+
+        t0 = time.perf_counter()
+        migrations.migrate(conn)
+        print(f"Migrasi ke versi {migrations.schema_version(conn)} (rebuild rekap_bulanan): "
+              f"{time.perf_counter() - t0:.1f} s")
+
+        hasil = {
+            "rekap dari data mentah": ukur(lambda: rekap_mentah(conn), args.repeat),
+            "karyawan per bulan": ukur(rollup(conn, False, True), args.repeat),
+            "karyawan setahun": ukur(rollup(conn, False, False), args.repeat),
+            "divisi per bulan": ukur(rollup(conn, True, True), args.repeat),
+            "divisi setahun": ukur(rollup(conn, True, False), args.repeat),
+            "refresh satu bulan": ukur(lambda: laporan.refresh_bulan(conn, f"{TAHUN}-06"), args.repeat),
+            "refresh satu karyawan": ukur(lambda: laporan.refresh_bulan(conn, f"{TAHUN}-06", 42),
+                                          args.repeat),
+        }
+        conn.rollback()
+        conn.close()
+
+    print(f"{'operasi':<26}{'median (ms)':>14}")
+    for nama, ms in hasil.items():
+        print(f"{nama:<26}{ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Waktu cold start dan rerun hangat absen.py per role, diukur dengan AppTest
+# Streamlit (tanpa browser). Setiap role dijalankan di proses Python baru
+# agar cold start benar-benar dingin (sys.modules kosong).
+#
+#   python -m benchmarks.bench_startup
+#   python -m benchmarks.bench_startup --app /path/absen.py --json startup.json
+#   python -m benchmarks.bench_startup --batas-dingin 8000 --batas-hangat 300
+#
+# Yang diukur per role:
+#   impor_streamlit  import streamlit + AppTest (sama untuk semua versi app)
+#   dingin_login     run pertama script sampai halaman login (import modul
+#                    app, migrasi/init sekali per proses)
+#   dingin_halaman   klik Login sampai halaman pertama role tsb tampil
+#   hangat           rerun berikutnya pada halaman yang sama (p50/p95)
+#
+# Uji penerimaan: app tidak memuat streamlit_calendar/plotly untuk role
+# Karyawan, tidak memuat matplotlib sama sekali, dan (jika diisi) p50 cold
+# start/rerun hangat tidak melebihi batas. Exit code 1 jika ada yang gagal.
+# Modul yang sudah diimpor oleh Streamlit sendiri (plotly, untuk tema grafik)
+# dicatat terpisah di dimuat_streamlit dan tidak dihitung.
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODUL_BERAT = ("plotly", "streamlit_calendar", "matplotlib")
+# Modul berat yang memang boleh dimuat oleh halaman pertama role tsb.
+BOLEH = {"Admin": ("plotly",), "Karyawan": ()}
+AKUN = {"Admin": "admin:admin123", "Karyawan": "karyawan1:karyawan123"}
+
+
+def ukur_role(app, akun, rerun):
+    # Dijalankan di proses anak; hasil dicetak sebagai JSON.
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    impor = (time.perf_counter() - t0) * 1000
+    # Streamlit sendiri mengimpor plotly (tema grafik) jika terpasang; yang
+    # dihitung hanya modul berat yang dimuat oleh app.
+    sudah = {m for m in MODUL_BERAT if m in sys.modules}
+
+    # Modul app (repository, halaman, ...) diambil dari direktori app itu sendiri.
+    sys.path.insert(0, os.path.dirname(app))
+    username, password = akun.split(":", 1)
+    at = AppTest.from_file(app, default_timeout=120)
+    t0 = time.perf_counter()
+    at.run()
+    dingin_login = (time.perf_counter() - t0) * 1000
+    at.text_input(key="username_input").input(username)
+    at.text_input(key="password_input").input(password)
+    t0 = time.perf_counter()
+    at.button(key="login_button").click().run()
+    dingin_halaman = (time.perf_counter() - t0) * 1000
+    if at.exception or not at.session_state.logged_in:
+        raise SystemExit(f"Login {username} gagal: {[e.message for e in at.exception]}")
+
+    hangat = []
+    for _ in range(rerun):
+        t0 = time.perf_counter()
+        at.run()
+        hangat.append((time.perf_counter() - t0) * 1000)
+    return {"menu": at.session_state.menu, "impor_streamlit_ms": impor, "dingin_login_ms": dingin_login,
+            "dingin_halaman_ms": dingin_halaman, "dingin_total_ms": dingin_login + dingin_halaman,
+            "hangat_p50_ms": statistics.median(hangat),
+            "hangat_p95_ms": sorted(hangat)[max(0, round(0.95 * len(hangat)) - 1)],
+            "modul_berat": sorted(m for m in MODUL_BERAT if m in sys.modules and m not in sudah),
+            "dimuat_streamlit": sorted(sudah)}
+
+
+def jalankan_anak(app, db, role, akun, rerun, ulang):
+    env = dict(os.environ, ABSENSI_DB=db, INSTRUMEN="")
+    hasil = []
+    for _ in range(ulang):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--anak", app, akun, str(rerun)],
+                             cwd=ROOT, env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            raise SystemExit(f"{role}: {out.stderr.strip()[-2000:]}")
+        hasil.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    # Median per metrik dari beberapa proses dingin.
+    gabung = {k: statistics.median(h[k] for h in hasil) for k in hasil[0] if k.endswith("_ms")}
+    gabung.update(menu=hasil[0]["menu"], modul_berat=hasil[0]["modul_berat"],
+                  dimuat_streamlit=hasil[0]["dimuat_streamlit"], proses=ulang)
+    return gabung
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--anak":
+        print(json.dumps(ukur_role(sys.argv[2], sys.argv[3], int(sys.argv[4]))))
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default=os.path.join(ROOT, "absen.py"))
+    parser.add_argument("--db", default=os.path.join(ROOT, "absensi.db"), help="disalin, tidak diubah")
+    parser.add_argument("--rerun", type=int, default=10, help="jumlah rerun hangat per proses")
+    parser.add_argument("--ulang", type=int, default=3, help="jumlah proses dingin per role")
+    parser.add_argument("--batas-dingin", type=float, help="batas p50 dingin_total (ms)")
+    parser.add_argument("--batas-hangat", type=float, help="batas p50 rerun hangat (ms)")
+    parser.add_argument("--json", help="tulis hasil ke file JSON ini")
+    args = parser.parse_args()
+
+    hasil, gagal = {}, []
+    with tempfile.TemporaryDirectory() as tmp:
+        for role, akun in AKUN.items():
+            # Salinan baru per role: migrasi di cold start ikut terukur sama untuk semua role.
+            db = os.path.join(tmp, f"{role}.db")
+            shutil.copyfile(args.db, db)
+            hasil[role] = jalankan_anak(os.path.abspath(args.app), db, role, akun, args.rerun, args.ulang)
+
+    print(f"{'role':<10}{'impor st':>10}{'dingin login':>14}{'dingin halaman':>16}{'dingin total':>14}"
+          f"{'hangat p50':>12}{'hangat p95':>12}  modul berat (app)")
+    for role, h in hasil.items():
+        print(f"{role:<10}{h['impor_streamlit_ms']:>10.0f}{h['dingin_login_ms']:>14.0f}{h['dingin_halaman_ms']:>16.0f}"
+              f"{h['dingin_total_ms']:>14.0f}{h['hangat_p50_ms']:>12.1f}{h['hangat_p95_ms']:>12.1f}  "
+              f"{', '.join(h['modul_berat']) or '-'}")
+
+        terlarang = [m for m in h["modul_berat"] if m not in BOLEH[role]]
+        if terlarang:
+            gagal.append(f"{role} memuat {', '.join(terlarang)}")
+        if args.batas_dingin and h["dingin_total_ms"] > args.batas_dingin:
+            gagal.append(f"{role} cold start {h['dingin_total_ms']:.0f} ms > {args.batas_dingin:.0f} ms")
+        if args.batas_hangat and h["hangat_p50_ms"] > args.batas_hangat:
+            gagal.append(f"{role} rerun hangat {h['hangat_p50_ms']:.1f} ms > {args.batas_hangat:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"app": args.app, "hasil": hasil, "gagal": gagal}, f, indent=2)
+    for g in gagal:
+        print(f"GAGAL: {g}")
+    if gagal:
+        sys.exit(1)
+    print("Lulus.")
+
+
+if __name__ == "__main__":
+    main()
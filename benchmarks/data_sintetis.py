@@ -0,0 +1,189 @@
+# Generator database sintetis untuk benchmark: karyawan, izin (dengan file
+# persetujuan berukuran realistis) dan absensi harian beberapa tahun.
+#
+#   python -m benchmarks.data_sintetis --keluar /tmp/bench.db --karyawan 10000 --tahun 2022 2024
+#
+# Skema dibuat lewat migrations.migrate, lalu ringkasan harian dan rekap
+# bulanan dihitung ulang sehingga isi database sama dengan hasil pemakaian
+# aplikasi. Nama karyawan "KARYAWAN <ID>" sama dengan workbook di
+# bench_impor.buat_workbook, jadi file impor sintetis cocok dengan tabel karyawan.
+#
+# Setiap izin punya file persetujuan sendiri: gambar JPEG dari sekumpulan kecil
+# gambar dasar (ukuran log-normal di sekitar --lampiran-kb) ditambah beberapa
+# byte acak setelah penanda akhir JPEG, sehingga SHA-256 tiap file berbeda dan
+# tidak ikut dideduplikasi. Perkiraan ukuran database: jumlah izin x --lampiran-kb.
+
+import argparse
+import hashlib
+import io
+import math
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import laporan
+import migrations
+import presensi
+import repository as repo
+import ringkasan
+
+JENIS = ["Cuti", "Telat", "Sakit", "WFH"]
+JUMLAH_DIVISI = 25
+GAMBAR_DASAR = 32
+
+# Porsi status izin: sebagian kecil masih Pending (antrean Dashboard/Accept).
+BOBOT_STATUS = {ringkasan.STATUS_DITERIMA: 0.72, repo.STATUS_DITOLAK: 0.25, "Pending": 0.03}
+# Porsi hari kerja tanpa jam datang (status "No Data").
+PORSI_TANPA_DATA = 0.02
+
+
+def nama_karyawan(kid):
+    return f"KARYAWAN {kid}"
+
+
+def divisi_karyawan(kid):
+    return f"Divisi {kid % JUMLAH_DIVISI}"
+
+
+def hari_kerja(tahun_awal, tahun_akhir):
+    awal, akhir = date(tahun_awal, 1, 1), date(tahun_akhir, 12, 31)
+    return [d for d in (awal + timedelta(days=i) for i in range((akhir - awal).days + 1)) if d.weekday() < 5]
+
+
+def buat_gambar_dasar(rnd, median_kb, jumlah=GAMBAR_DASAR):
+    # (jpeg, thumbnail) dengan ukuran log-normal; gambar noise agar JPEG tidak
+    # terkompresi jauh lebih kecil dari target.
+    from PIL import Image
+
+    hasil = []
+    for _ in range(jumlah):
+        target = min(max(rnd.lognormvariate(math.log(median_kb * 1024), 0.6), 20 * 1024), 5 * 1024 * 1024)
+        # Noise JPEG kualitas 85 kira-kira 0,75 byte per piksel.
+        sisi = max(64, int(math.sqrt(target / 0.75)))
+        img = Image.frombytes("RGB", (sisi, sisi), rnd.randbytes(sisi * sisi * 3))
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=85)
+        data = buf.getvalue()
+        hasil.append((data, repo.buat_thumbnail(data)))
+    return hasil
+
+
+def isi_karyawan(conn, karyawan):
+    conn.executemany("INSERT INTO karyawan (ID, Nama, Divisi) VALUES (?, ?, ?)",
+                     ((k, nama_karyawan(k), divisi_karyawan(k)) for k in range(1, karyawan + 1)))
+
+
+def isi_izin(conn, rnd, karyawan, hari, izin_per_tahun, gambar):
+    # Mengembalikan baris absensi "Izin" untuk izin yang diterima, seperti Accept.
+    tahun = len({d.year for d in hari})
+    status, bobot = list(BOBOT_STATUS), list(BOBOT_STATUS.values())
+    baris_izin = []
+    for k in range(1, karyawan + 1):
+        for _ in range(izin_per_tahun * tahun):
+            mulai = rnd.choice(hari)
+            jumlah = rnd.choices([1, 2, 3, 5, 10], weights=[50, 25, 12, 10, 3])[0]
+            pengajuan = mulai - timedelta(days=rnd.randint(0, 14))
+            baris_izin.append((k, rnd.choice(JENIS), pengajuan.isoformat(), mulai, jumlah,
+                               rnd.choices(status, weights=bobot)[0]))
+
+    lampiran, rows, izin_absensi = [], [], []
+    for k, jenis, pengajuan, mulai, jumlah, st in baris_izin:
+        data, thumb = rnd.choice(gambar)
+        data = data + rnd.randbytes(16)
+        sha = hashlib.sha256(data).hexdigest()
+        lampiran.append((sha, "image/jpeg", len(data), data, thumb))
+        selesai = mulai + timedelta(days=jumlah - 1)
+        rows.append((nama_karyawan(k), divisi_karyawan(k), jenis, pengajuan, mulai.isoformat(), selesai.isoformat(),
+                     jumlah, sha, st, k))
+        if st == ringkasan.STATUS_DITERIMA:
+            izin_absensi += [(nama_karyawan(k), divisi_karyawan(k), (mulai + timedelta(days=i)).isoformat(),
+                              "", "", "Izin", k) for i in range(jumlah)]
+        if len(lampiran) >= 1000:
+            conn.executemany("INSERT OR IGNORE INTO lampiran (sha256, tipe, ukuran, data, thumbnail) "
+                             "VALUES (?, ?, ?, ?, ?)", lampiran)
+            lampiran.clear()
+    conn.executemany("INSERT OR IGNORE INTO lampiran (sha256, tipe, ukuran, data, thumbnail) "
+                     "VALUES (?, ?, ?, ?, ?)", lampiran)
+    conn.executemany("INSERT INTO izin (nama, divisi, jenis_pengajuan, tanggal_pengajuan, tanggal_izin, "
+                     "tanggal_selesai, jumlah_hari, lampiran_sha256, status, karyawan_id) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return izin_absensi
+
+
+def isi_absensi(conn, rnd, karyawan, hari):
+    batas = presensi.batas_detik() // 60
+
+    def absensi():
+        for d in hari:
+            tanggal = d.isoformat()
+            for k in range(1, karyawan + 1):
+                if rnd.random() < PORSI_TANPA_DATA:
+                    yield (nama_karyawan(k), divisi_karyawan(k), tanggal, None, None, "No Data", k)
+                    continue
+                datang = int(rnd.gauss(8 * 60 + 30, 35))
+                pulang = 17 * 60 + rnd.randint(0, 120)
+                yield (nama_karyawan(k), divisi_karyawan(k), tanggal, f"{datang // 60:02d}:{datang % 60:02d}",
+                       f"{pulang // 60:02d}:{pulang % 60:02d}", "Telat" if datang > batas else "Tepat Waktu", k)
+
+    conn.executemany(repo.SQL_INSERT_ABSENSI, absensi())
+
+
+def buat(path, karyawan, tahun_awal, tahun_akhir, izin_per_tahun=4, lampiran_kb=120, seed=42, log=print):
+    rnd = random.Random(seed)
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} sudah ada")
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        migrations.migrate(conn)
+        hari = hari_kerja(tahun_awal, tahun_akhir)
+
+        t0 = time.perf_counter()
+        isi_karyawan(conn, karyawan)
+        gambar = buat_gambar_dasar(rnd, lampiran_kb)
+        izin_absensi = isi_izin(conn, rnd, karyawan, hari, izin_per_tahun, gambar)
+        conn.commit()
+        log(f"karyawan dan izin: {time.perf_counter() - t0:.1f} s")
+
+        t0 = time.perf_counter()
+        isi_absensi(conn, rnd, karyawan, hari)
+        # Izin diterima menimpa hari kerja yang tercakup, seperti saat Accept.
+        conn.executemany(repo.SQL_INSERT_ABSENSI, izin_absensi)
+        conn.commit()
+        log(f"absensi: {time.perf_counter() - t0:.1f} s")
+
+        t0 = time.perf_counter()
+        ringkasan.rebuild(conn)
+        laporan.rebuild(conn)
+        conn.commit()
+        log(f"ringkasan dan rekap: {time.perf_counter() - t0:.1f} s")
+
+        jumlah = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                  for t in ("karyawan", "izin", "absensi", "lampiran")}
+        jumlah["pending"] = conn.execute("SELECT COUNT(*) FROM izin WHERE status = 'Pending'").fetchone()[0]
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return jumlah
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keluar", required=True, help="path database baru")
+    parser.add_argument("--karyawan", type=int, default=1000)
+    parser.add_argument("--tahun", type=int, nargs=2, default=[2024, 2024], metavar=("AWAL", "AKHIR"))
+    parser.add_argument("--izin", type=int, default=4, help="izin per karyawan per tahun")
+    parser.add_argument("--lampiran-kb", type=int, default=120, help="median ukuran file persetujuan")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    jumlah = buat(args.keluar, args.karyawan, args.tahun[0], args.tahun[1], args.izin, args.lampiran_kb, args.seed)
+    print(", ".join(f"{n} {t}" for t, n in jumlah.items()))
+    print(f"{args.keluar}: {os.path.getsize(args.keluar) / 1024 / 1024:.0f} MB ({time.perf_counter() - t0:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
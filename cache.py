@@ -0,0 +1,89 @@
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import instrumen
+
+# --- Cache Hasil Query ---
+# LRU per proses dengan batas ukuran (byte). Kunci cache = nama fungsi +
+# parameter + versi tabel yang dibaca (tabel versi_data), sehingga setiap
+# penulisan dari sesi atau proses mana pun otomatis membuat entri lama tidak
+# terpakai lagi; entri itu akhirnya tergeser oleh LRU.
+
+CACHE_MAKS_BYTES = int(os.environ.get("CACHE_MAKS_MB", "64")) * 1024 * 1024
+
+
+def ukuran(nilai):
+    if isinstance(nilai, pd.DataFrame):
+        return int(nilai.memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(nilai)
+
+
+class QueryCache:
+    def __init__(self, maks_bytes=CACHE_MAKS_BYTES):
+        self.maks_bytes = maks_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, nilai):
+        n = ukuran(nilai)
+        if n > self.maks_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            self._data[key] = (nilai, n)
+            self._bytes += n
+            while self._bytes > self.maks_bytes:
+                self._bytes -= self._data.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def statistik(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0,
+                    "entri": len(self._data), "bytes": self._bytes}
+
+
+query_cache = QueryCache()
+
+
+def cached(*tabel, versi_fn):
+    # versi_fn() -> {tabel: versi}; dipanggil sekali per pemanggilan fungsi.
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            versi = versi_fn()
+            key = (fn.__qualname__, args, tuple(sorted(kwargs.items())), tuple(versi.get(t) for t in tabel))
+            with instrumen.bagian(fn.__qualname__, "cache") as entri:
+                ada, nilai = query_cache.get(key)
+                if not ada:
+                    nilai = fn(*args, **kwargs)
+                    query_cache.put(key, nilai)
+                if entri is not None:
+                    entri["hit"] = ada
+            # Salinan agar pemanggil bebas mengubah DataFrame tanpa merusak cache.
+            return nilai.copy() if isinstance(nilai, pd.DataFrame) else nilai
+        return wrapper
+    return deco
@@ -0,0 +1,154 @@
+import argparse
+import csv
+import difflib
+import sys
+
+# --- Pencocokan Nama ke karyawan.ID ---
+# Mengisi kolom karyawan_id pada absensi dan izin lama yang hanya menyimpan
+# nama sebagai teks bebas. Nama dinormalisasi (huruf kecil, spasi dirapikan);
+# nama yang sama persis dengan tepat satu karyawan sudah diisi oleh migrasi
+# 11 dan di sini dianggap "otomatis". Sisanya dicocokkan dengan difflib dan
+# ditulis ke laporan untuk ditinjau sebelum diterapkan.
+#
+#   python cocok_nama.py --laporan tinjau.csv
+#   python cocok_nama.py --laporan tinjau.csv --terapkan
+#   python cocok_nama.py --dari-laporan tinjau.csv
+#
+# Kolom keputusan pada laporan: "otomatis" (skor >= ambang dan jelas lebih
+# baik dari kandidat kedua), "tinjau" atau "tidak cocok". --terapkan hanya
+# mengisi yang "otomatis"; --dari-laporan mengisi baris "otomatis" dan
+# "terima" (ubah keputusan/karyawan_id di laporan setelah ditinjau).
+
+TABEL = ("absensi", "izin")
+AMBANG = 0.85
+SELISIH_MIN = 0.05
+SKOR_MIN = 0.6
+
+KOLOM_LAPORAN = ["tabel", "nama", "jumlah_baris", "karyawan_id", "nama_karyawan", "skor", "skor_kedua", "keputusan"]
+
+
+def normal(nama):
+    return " ".join(str(nama or "").lower().split())
+
+
+def indeks_karyawan(conn):
+    # {nama normal: [ID, ...]}
+    indeks = {}
+    for kid, nama in conn.execute("SELECT ID, Nama FROM karyawan WHERE Nama IS NOT NULL"):
+        indeks.setdefault(normal(nama), []).append(kid)
+    return indeks
+
+
+def nama_tanpa_id(conn):
+    # (tabel, nama, jumlah baris) yang karyawan_id-nya masih kosong.
+    hasil = []
+    for tabel in TABEL:
+        hasil += [(tabel, nama, n) for nama, n in conn.execute(
+            f"SELECT nama, COUNT(*) FROM {tabel} WHERE karyawan_id IS NULL AND nama IS NOT NULL GROUP BY nama")]
+    return hasil
+
+
+def cocokkan(conn, ambang=AMBANG):
+    indeks = indeks_karyawan(conn)
+    kunci = list(indeks)
+    nama_karyawan = dict(conn.execute("SELECT ID, Nama FROM karyawan"))
+    laporan = []
+    for tabel, nama, jumlah in nama_tanpa_id(conn):
+        n = normal(nama)
+        if n in indeks:
+            ids = indeks[n]
+            skor, skor_kedua = 1.0, 1.0 if len(ids) > 1 else 0.0
+            kandidat = ids[0]
+        else:
+            mirip = difflib.get_close_matches(n, kunci, n=2, cutoff=SKOR_MIN)
+            if not mirip:
+                laporan.append(dict(tabel=tabel, nama=nama, jumlah_baris=jumlah, karyawan_id=None,
+                                    nama_karyawan=None, skor=0.0, skor_kedua=0.0, keputusan="tidak cocok"))
+                continue
+            # Urutan argumen sama dengan get_close_matches (ratio tidak simetris).
+            skor = difflib.SequenceMatcher(None, mirip[0], n).ratio()
+            skor_kedua = difflib.SequenceMatcher(None, mirip[1], n).ratio() if len(mirip) > 1 else 0.0
+            # Nama karyawan ganda (dua ID dengan nama sama) selalu ditinjau.
+            if len(indeks[mirip[0]]) > 1:
+                skor_kedua = skor
+            kandidat = indeks[mirip[0]][0]
+        keputusan = "otomatis" if skor >= ambang and skor - skor_kedua >= SELISIH_MIN else "tinjau"
+        laporan.append(dict(tabel=tabel, nama=nama, jumlah_baris=jumlah, karyawan_id=kandidat,
+                            nama_karyawan=nama_karyawan.get(kandidat), skor=round(skor, 3),
+                            skor_kedua=round(skor_kedua, 3), keputusan=keputusan))
+    return laporan
+
+
+def terapkan(conn, pasangan):
+    # pasangan: iterable (tabel, nama, karyawan_id). Hanya baris yang masih
+    # kosong yang diisi; memakai indeks pada nama. Absensi unik per
+    # (karyawan_id, tanggal): baris tanpa id pada tanggal yang sudah tercatat
+    # untuk karyawan itu adalah duplikat dengan ejaan lain dan dibuang, baris
+    # yang sudah ber-id dipertahankan. Pemanggil menghitung ulang ringkasan
+    # dan rekap.
+    jumlah = 0
+    for tabel in TABEL:
+        for t, nama, kid in pasangan:
+            if t != tabel or kid is None:
+                continue
+            if tabel == "absensi":
+                conn.execute("DELETE FROM absensi WHERE nama = ? AND karyawan_id IS NULL AND tanggal IN "
+                             "(SELECT tanggal FROM absensi WHERE karyawan_id = ?)", (nama, kid))
+            jumlah += conn.execute(f"UPDATE {tabel} SET karyawan_id = ? WHERE nama = ? AND karyawan_id IS NULL",
+                                   (kid, nama)).rowcount
+    return jumlah
+
+
+def tulis_laporan(path, laporan):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        tulis = csv.DictWriter(f, fieldnames=KOLOM_LAPORAN)
+        tulis.writeheader()
+        tulis.writerows(laporan)
+
+
+def baca_laporan(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(r["tabel"], r["nama"], int(r["karyawan_id"])) for r in csv.DictReader(f)
+                if r["keputusan"].strip().lower() in ("otomatis", "terima") and r["karyawan_id"].strip()]
+
+
+def main(argv=None):
+    import laporan
+    import repository as repo
+    import ringkasan
+
+    parser = argparse.ArgumentParser(prog="cocok_nama.py")
+    parser.add_argument("--laporan", help="tulis laporan tinjauan ke CSV ini")
+    parser.add_argument("--ambang", type=float, default=AMBANG, help="skor minimal untuk keputusan otomatis")
+    parser.add_argument("--terapkan", action="store_true", help="isi karyawan_id untuk kecocokan otomatis")
+    parser.add_argument("--dari-laporan", help="isi karyawan_id dari laporan yang sudah ditinjau")
+    args = parser.parse_args(argv)
+
+    repo.init_db()
+    if args.dari_laporan:
+        pasangan = baca_laporan(args.dari_laporan)
+    else:
+        with repo.koneksi() as conn:
+            laporan = cocokkan(conn, args.ambang)
+        if args.laporan:
+            tulis_laporan(args.laporan, laporan)
+            print(f"Laporan ditulis ke {args.laporan}")
+        for keputusan in ("otomatis", "tinjau", "tidak cocok"):
+            baris = [r for r in laporan if r["keputusan"] == keputusan]
+            print(f"{keputusan:<12}: {len(baris)} nama, {sum(r['jumlah_baris'] for r in baris)} baris")
+        if not args.terapkan:
+            return 0
+        pasangan = [(r["tabel"], r["nama"], r["karyawan_id"]) for r in laporan if r["keputusan"] == "otomatis"]
+    with repo.transaksi() as conn:
+        jumlah = terapkan(conn, pasangan)
+        # Rekap dikelompokkan per karyawan_id, dan duplikat yang dibuang
+        # mengubah jumlah hadir harian.
+        ringkasan.rebuild(conn)
+        laporan.rebuild(conn)
+        repo.naikkan_versi(conn, *TABEL)
+    print(f"karyawan_id diisi pada {jumlah} baris.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import instrumen
+import jobs
+import repository as repo
+from halaman.umum import ambil_thumbnail, pilih_halaman, tampilkan_lampiran
+
+warna_biru = "#003C8D"
+warna_kuning = "#FFD700"
+
+# --- Jalur Data ---
+# Tanpa pemanggilan st.*, sehingga benchmarks/bench_halaman.py menjalankan
+# kode yang sama dengan halaman ini.
+
+def grafik_jenis():
+    # Figure jumlah izin per jenis, atau None jika belum ada izin.
+    jenis_count = repo.count_izin_per_jenis()
+    if jenis_count.empty:
+        return None
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=jenis_count['jenis_pengajuan'],
+        y=jenis_count['Jumlah'],
+        marker=dict(color=[warna_biru if x!="WFH" else warna_kuning for x in jenis_count['jenis_pengajuan']]),
+        text=jenis_count['Jumlah'], textposition='outside'
+    ))
+    fig.update_layout(
+        title="Jumlah Pengajuan Izin per Jenis", xaxis_title="Jenis Pengajuan",
+        yaxis_title="Jumlah Pengajuan", plot_bgcolor='rgba(0,0,0,0)', template="plotly_dark"
+    )
+    return fig
+
+def data_pending(pilih, thumbnail):
+    # pilih(total) -> (limit, offset); thumbnail(sha256) -> bytes atau None.
+    # Mengembalikan (total, df_pending, id yang sedang diproses, {sha256: thumbnail}).
+    total_pending = repo.count_izin(status="Pending")
+    if total_pending == 0:
+        return 0, None, set(), {}
+    limit, offset = pilih(total_pending)
+    df_pending = repo.load_izin(status="Pending", limit=limit, offset=offset)
+    diproses = {p['izin_id'] for p in jobs.parameter_aktif("terima_izin")}
+    thumbs = {sha: thumbnail(sha) for sha in df_pending['lampiran_sha256'].dropna()}
+    return total_pending, df_pending, diproses, thumbs
+
+# 2. Menu Admin: Dashboard
+def tampilkan(pengguna):
+    st.subheader("Dashboard Pengajuan Izin")
+    with instrumen.bagian("grafik jenis izin", "render"):
+        fig = grafik_jenis()
+        if fig is not None:
+            st.plotly_chart(fig, width="stretch")
+    if fig is None:
+        st.info("Belum ada data pengajuan izin.")
+    st.write("### Tabel Pengajuan Izin (Pending)")
+    total_pending, df_pending, diproses, thumbs = data_pending(lambda total: pilih_halaman(total, "pending"),
+                                                               ambil_thumbnail)
+    if total_pending == 0:
+        st.info("Tidak ada pengajuan izin yang pending.")
+    else:
+        with instrumen.bagian("tabel pending", "render"):
+            headers = ["ID","Nama","Divisi","Jenis Pengajuan","Tanggal Pengajuan","Tanggal Izin","Jumlah Hari","File Persetujuan","Status","Persetujuan"]
+            cols = st.columns(len(headers))
+            for i,h in enumerate(headers): cols[i].write(f"**{h}**")
+            for _,r in df_pending.iterrows():
+                row_cols = st.columns(len(headers))
+                row_cols[0].write(r['id']); row_cols[1].write(r['nama']); row_cols[2].write(r['divisi'])
+                row_cols[3].write(r['jenis_pengajuan']); row_cols[4].write(r['tanggal_pengajuan'])
+                row_cols[5].write(r['tanggal_izin']); row_cols[6].write(r['jumlah_hari'])
+                if r['lampiran_sha256']:
+                    thumb = thumbs.get(r['lampiran_sha256'])
+                    if thumb:
+                        row_cols[7].image(thumb, width=80)
+                    if row_cols[7].button("Lihat File", key=f"lf_{r['id']}"):
+                        st.session_state.lampiran_dibuka = (r['id'], r['lampiran_sha256'])
+                else:
+                    row_cols[7].write("Belum Disetujui")
+                row_cols[8].write(r['status'])
+                if r['id'] in diproses:
+                    row_cols[9].write("Diproses...")
+                    continue
+                if row_cols[9].button("Accept", key=f"ac_{r['id']}"):
+                    st.session_state.job_dipantau.append(jobs.kirim("terima_izin", {"izin_id": int(r['id'])}))
+                    st.rerun()
+                if row_cols[9].button("Reject", key=f"rj_{r['id']}"):
+                    repo.tolak_izin(r['id'])
+        tampilkan_lampiran()
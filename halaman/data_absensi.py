@@ -0,0 +1,79 @@
+import calendar as cal_mod  # Modul calendar Python
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import instrumen
+import repository as repo
+from halaman.umum import NAMA_BULAN, pilih_halaman, upload_absensi
+
+# --- Jalur Data ---
+# Tanpa pemanggilan st.*, sehingga benchmarks/bench_halaman.py menjalankan
+# kode yang sama dengan halaman ini.
+
+def data_bulan(tahun, bulan):
+    # Batas bulan, jumlah presensi, dan pilihan divisi (hanya jika ada data).
+    num_days = cal_mod.monthrange(tahun, bulan)[1]
+    awal, akhir = f"{tahun}-{bulan:02d}-01", f"{tahun}-{bulan:02d}-{num_days:02d}"
+    jumlah = repo.count_absensi(awal, akhir)
+    return {"awal": awal, "akhir": akhir, "jumlah": jumlah,
+            "divisi": repo.divisi_absensi(awal, akhir) if jumlah else []}
+
+def filter_absensi(mulai, selesai, divisi="Semua", nama="", status=()):
+    return dict(mulai=mulai, selesai=selesai, divisi=None if divisi == "Semua" else divisi,
+                nama=nama.strip() or None, status=tuple(status))
+
+def data_tabel(filter_absensi, pilih):
+    # pilih(total) -> (limit, offset). Mengembalikan (total, halaman data atau None).
+    total_absensi = repo.count_absensi(**filter_absensi)
+    if total_absensi == 0:
+        return 0, None
+    limit, offset = pilih(total_absensi)
+    return total_absensi, repo.cari_absensi(**filter_absensi, limit=limit, offset=offset)
+
+def highlight_telat(df):
+    # Satu perbandingan per halaman, bukan fungsi Python per baris.
+    warna = np.where(df['status'].str.lower().eq('telat'), 'background-color: #ffcccc', '')
+    return pd.DataFrame(np.repeat(warna[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+
+# 4. Menu Admin: Data Absensi
+def tampilkan(pengguna):
+    st.subheader("Data Presensi Karyawan")
+
+    # Pilih Tahun, Bulan, Rentang
+    selected_year = st.number_input("Pilih Tahun",2000,2100,2024)
+    selected_month = st.selectbox("Pilih Bulan", list(range(1,13)), format_func=lambda x: NAMA_BULAN[x])
+    num_days = cal_mod.monthrange(selected_year, selected_month)[1]
+    start_date, end_date = st.date_input(
+        "Pilih Rentang Tanggal",
+        value=(datetime(selected_year, selected_month,1), datetime(selected_year, selected_month,num_days)),
+        min_value=datetime(selected_year, selected_month,1), max_value=datetime(selected_year, selected_month,num_days)
+    )
+
+    month_str=f"{selected_year}-{selected_month:02d}"
+
+    # Hanya presensi (bukan Cuti/Sakit/WFH); filter dan paging dikerjakan di SQL.
+    bulan_ini = data_bulan(selected_year, selected_month)
+    if bulan_ini["jumlah"] == 0:
+        st.info(f"Data absensi untuk {month_str} belum ada. Silakan upload.")
+        upload_absensi(selected_year, selected_month, key="upload_baru")
+    else:
+        with st.expander("Upload ulang data bulan ini"):
+            upload_absensi(selected_year, selected_month, key="upload_ulang", boleh_ganti=True)
+        f1, f2, f3 = st.columns(3)
+        divisi_filter = f1.selectbox("Divisi", ["Semua"] + bulan_ini["divisi"])
+        nama_filter = f2.text_input("Cari Nama")
+        status_filter = f3.multiselect("Status", ["Tepat Waktu", "Telat", "Izin", "Invalid Time", "No Data"])
+        total_absensi, page_df = data_tabel(
+            filter_absensi(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'),
+                           divisi_filter, nama_filter, status_filter),
+            lambda total: pilih_halaman(total, "absensi"))
+        if total_absensi == 0:
+            st.info("Tidak ada data untuk rentang tersebut.")
+        else:
+            with instrumen.bagian("tabel absensi", "render"):
+                styled_df = page_df.style.apply(highlight_telat, axis=None)
+                st.write(f"**Data Presensi untuk {start_date.strftime('%d %B %Y')} hingga {end_date.strftime('%d %B %Y')} ({total_absensi} baris):**")
+                st.dataframe(styled_df, width="stretch")
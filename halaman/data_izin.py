@@ -0,0 +1,31 @@
+import streamlit as st
+
+import instrumen
+import repository as repo
+from halaman.umum import pilih_halaman, tampilkan_lampiran, thumbnail_uri
+
+# 3. Menu Admin: Data Pengajuan Izin Diterima
+def tampilkan(pengguna):
+    st.subheader("Data Pengajuan Izin Karyawan")
+    jenis_filter = st.selectbox("Pilih Jenis Pengajuan", ["Semua","Cuti","Telat","Sakit","WFH"])
+    jenis = None if jenis_filter == "Semua" else jenis_filter
+    total_izin = repo.count_izin(status=repo.STATUS_DITERIMA, jenis_pengajuan=jenis)
+    if total_izin == 0:
+        st.info(f"Tidak ada data untuk jenis '{jenis_filter}'.")
+    else:
+        limit, offset = pilih_halaman(total_izin, f"izin_{jenis_filter}")
+        df_izin = repo.load_izin(status=repo.STATUS_DITERIMA, jenis_pengajuan=jenis, limit=limit, offset=offset)
+        with instrumen.bagian("thumbnail ke data URI", "pandas"):
+            df_izin['file_persetujuan'] = df_izin['lampiran_sha256'].map(thumbnail_uri)
+        with instrumen.bagian("tabel izin", "render"):
+            st.dataframe(
+                df_izin.drop(columns=['lampiran_sha256']), hide_index=True, width="stretch",
+                column_config={"file_persetujuan": st.column_config.ImageColumn("File Persetujuan")}
+            )
+        df_file = df_izin[df_izin['lampiran_sha256'].notna()]
+        if not df_file.empty:
+            pilih_id = st.selectbox("Pilih ID untuk melihat file persetujuan", df_file['id'].tolist())
+            if st.button("Lihat File"):
+                sha = df_file.loc[df_file['id'] == pilih_id, 'lampiran_sha256'].iloc[0]
+                st.session_state.lampiran_dibuka = (pilih_id, sha)
+            tampilkan_lampiran()
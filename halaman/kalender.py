@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import streamlit as st
+from streamlit_calendar import calendar
+
+import instrumen
+import repository as repo
+from halaman.umum import NAMA_BULAN
+
+# --- Jalur Data ---
+# Tanpa pemanggilan st.*, sehingga benchmarks/bench_halaman.py menjalankan
+# kode yang sama dengan halaman ini.
+
+def event_bulan(tahun, bulan):
+    # Hanya ringkasan bulan yang ditampilkan yang dibaca dari daily_summary.
+    df_ringkasan = repo.load_ringkasan_bulan(tahun, bulan)
+    return [{"title":f"H:{r.hadir} T:{r.telat} TH:{r.tidak_hadir}","start":r.tanggal,"color":"transparent","textColor":"black"}
+            for r in df_ringkasan.itertuples(index=False)]
+
+def rincian_tanggal(tanggal):
+    # (karyawan hadir, izin aktif) pada tanggal "YYYY-MM-DD".
+    df_abs = repo.load_absensi_tanggal(tanggal)
+    df_absent = repo.izin_aktif_pada(tanggal)
+    # Dicocokkan lewat karyawan_id; nama hanya dipakai jika salah satu sisi belum punya karyawan_id.
+    izin_tanpa_id = df_absent.loc[df_absent['karyawan_id'].isna(), 'nama']
+    sedang_izin = (df_abs['karyawan_id'].isin(df_absent['karyawan_id'].dropna())
+                   | df_abs['nama'].isin(izin_tanpa_id)
+                   | (df_abs['karyawan_id'].isna() & df_abs['nama'].isin(df_absent['nama'])))
+    return df_abs[~sedang_izin], df_absent
+
+# 5. Menu Admin: Kalender Absensi
+def tampilkan(pengguna):
+    if "detail_type" not in st.session_state:
+        st.session_state.detail_type = None
+    st.subheader("Kalender Absensi Karyawan")
+    hari_ini = datetime.today()
+    c_tahun, c_bulan = st.columns(2)
+    kal_year = c_tahun.number_input("Tahun", 2000, 2100, hari_ini.year, key="kal_tahun")
+    kal_month = c_bulan.selectbox("Bulan", list(range(1,13)), index=hari_ini.month-1, format_func=lambda x: NAMA_BULAN[x], key="kal_bulan")
+
+    with instrumen.bagian("kalender", "render"):
+        events = event_bulan(kal_year, kal_month)
+        calendar(events=events, options={"editable":False,"header":{'"left"':'prev,next today','"center"':'title','"right"':'month,agendaWeek,agendaDay'},"defaultView":"month",
+                                         "initialDate":f"{kal_year}-{kal_month:02d}-01"}, key=f"kalender_{kal_year}_{kal_month}")
+    st.markdown("---")
+
+    sel_date = st.date_input("Pilih Tanggal untuk rincian", value=datetime.today())
+    sd_str = sel_date.strftime("%Y-%m-%d")
+
+    with instrumen.bagian("gabung absensi dan izin", "pandas"):
+        karyawan_hadir, df_absent = rincian_tanggal(sd_str)
+
+        hadir_count = len(karyawan_hadir)
+        telat_count = len(karyawan_hadir[karyawan_hadir['status'].str.lower()=='telat'])
+        tidak_hadir_count = len(df_absent)
+
+    st.markdown(f"### Ringkasan Absensi untuk {sel_date.strftime('%A, %d %B %Y')}")
+    c1,c2,c3 = st.columns(3)
+    if c1.button(f"{hadir_count} karyawan hadir"): st.session_state.detail_type='hadir'
+    if c2.button(f"{telat_count} karyawan terlambat"): st.session_state.detail_type='telat'
+    if c3.button(f"{tidak_hadir_count} karyawan tidak hadir"): st.session_state.detail_type='tidak_hadir'
+
+    if st.session_state.detail_type:
+        st.markdown("#### Rincian Data")
+        if st.button("Tutup rincian"): st.session_state.detail_type=None
+        if st.session_state.detail_type=='hadir':
+            karyawan_tepat = karyawan_hadir[karyawan_hadir['status'].str.lower()=='tepat waktu']
+            st.dataframe(karyawan_tepat, width="stretch")
+        elif st.session_state.detail_type=='telat':
+            st.dataframe(karyawan_hadir[karyawan_hadir['status'].str.lower()=='telat'], width="stretch")
+        elif st.session_state.detail_type=='tidak_hadir':
+            if df_absent.empty:
+                st.info("Tidak ada data karyawan tidak hadir untuk tanggal ini.")
+            else:
+                st.dataframe(df_absent[['nama','divisi','jenis_pengajuan','tanggal_izin','jumlah_hari']], width="stretch")
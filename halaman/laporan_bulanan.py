@@ -0,0 +1,52 @@
+import io
+from datetime import datetime
+
+import streamlit as st
+
+import instrumen
+import repository as repo
+from halaman.umum import NAMA_BULAN
+
+# 6. Menu Admin: Laporan Bulanan
+# Dibaca dari tabel rekap_bulanan (lihat laporan.py), bukan dihitung dari absensi mentah.
+def tampilkan(pengguna):
+    st.subheader("Laporan Bulanan Absensi")
+    hari_ini = datetime.today()
+    c_tahun, c_awal, c_akhir = st.columns(3)
+    lap_year = c_tahun.number_input("Tahun", 2000, 2100, hari_ini.year, key="lap_tahun")
+    bulan_awal = c_awal.selectbox("Dari Bulan", list(range(1,13)), index=0, format_func=lambda x: NAMA_BULAN[x], key="lap_awal")
+    bulan_akhir = c_akhir.selectbox("Sampai Bulan", list(range(1,13)), index=11, format_func=lambda x: NAMA_BULAN[x], key="lap_akhir")
+    c_tingkat, c_rinci = st.columns(2)
+    tingkat = c_tingkat.radio("Rekap per", ["Karyawan", "Divisi"], horizontal=True)
+    per_bulan = c_rinci.checkbox("Rinci per bulan", value=True)
+
+    if bulan_akhir < bulan_awal:
+        st.warning("Bulan akhir harus sama atau setelah bulan awal.")
+    else:
+        df_rekap = repo.load_rekap(f"{lap_year}-{bulan_awal:02d}", f"{lap_year}-{bulan_akhir:02d}",
+                                   per_divisi=tingkat == "Divisi", per_bulan=per_bulan)
+        if df_rekap.empty:
+            st.info("Belum ada data absensi untuk periode tersebut.")
+        else:
+            # Rata-rata menit datang ditampilkan sebagai jam; file unduhan tetap dalam menit.
+            with instrumen.bagian("format jam datang", "pandas"):
+                menit = df_rekap['rata_menit_datang'].round().astype('Int64')
+                jam_datang = ((menit // 60).astype(str).str.zfill(2) + ":" + (menit % 60).astype(str).str.zfill(2)).where(menit.notna(), "-")
+                tampil = df_rekap.rename(columns={'rata_menit_datang': 'rata_jam_datang'}).assign(rata_jam_datang=jam_datang)
+            st.write(f"**{len(df_rekap)} baris**")
+            with instrumen.bagian("tabel laporan", "render"):
+                st.dataframe(tampil, width="stretch", hide_index=True)
+
+            nama_file = f"laporan_{tingkat.lower()}_{lap_year}_{bulan_awal:02d}-{bulan_akhir:02d}"
+            d1, d2 = st.columns(2)
+            with instrumen.bagian("ekspor CSV", "pandas"):
+                csv_bytes = df_rekap.to_csv(index=False).encode("utf-8")
+            d1.download_button("Unduh CSV", csv_bytes, file_name=f"{nama_file}.csv", mime="text/csv")
+            try:
+                buf = io.BytesIO()
+                with instrumen.bagian("ekspor Parquet", "pandas"):
+                    df_rekap.to_parquet(buf, index=False)
+                d2.download_button("Unduh Parquet", buf.getvalue(), file_name=f"{nama_file}.parquet",
+                                   mime="application/octet-stream")
+            except ImportError:
+                d2.caption("Ekspor Parquet membutuhkan paket pyarrow.")
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import streamlit as st
+
+from repository import save_izin
+
+# 1. Menu Karyawan: Pengajuan Izin Kerja
+def tampilkan(pengguna):
+    st.subheader("Form Pengajuan Izin Tidak Masuk")
+    # Akun yang terhubung ke data karyawan tidak mengetik ulang nama/divisi.
+    terhubung = bool(pengguna["karyawan_id"] is not None and pengguna["nama"])
+    nama = st.text_input("Nama Karyawan", value=pengguna["nama"] if terhubung else "", disabled=terhubung)
+    divisi = st.text_input("Divisi", value=(pengguna["divisi"] or "") if terhubung else "", disabled=terhubung)
+    jenis_pengajuan = st.selectbox("Jenis Pengajuan", ["Cuti", "Telat", "Sakit", "WFH"])
+    tanggal_pengajuan = st.date_input("Tanggal Pengajuan", datetime.today())
+    tanggal_izin = st.date_input("Tanggal Izin", datetime.today())
+    jumlah_hari = st.number_input("Jumlah Hari", min_value=1, step=1)
+    file_persetujuan = st.file_uploader("Upload File Persetujuan (JPG, PNG)", type=["jpg", "png"])
+
+    if st.button("Ajukan Izin"):
+        # Validasi input form
+        if not nama.strip():
+            st.error("Mohon isi Nama Karyawan.")
+        elif not divisi.strip():
+            st.error("Mohon isi Divisi.")
+        elif not jenis_pengajuan:
+            st.error("Mohon pilih Jenis Pengajuan.")
+        elif tanggal_izin < tanggal_pengajuan:
+            st.error("Tanggal Izin tidak boleh lebih awal dari Tanggal Pengajuan.")
+        elif jumlah_hari < 1:
+            st.error("Jumlah Hari harus minimal 1.")
+        elif file_persetujuan is None:
+            st.error("Mohon upload file persetujuan.")
+        else:
+            blob = file_persetujuan.getvalue() if file_persetujuan else None
+            save_izin(nama, divisi, jenis_pengajuan, str(tanggal_pengajuan), str(tanggal_izin), jumlah_hari, blob,
+                      karyawan_id=pengguna["karyawan_id"])
+            st.success("Pengajuan izin berhasil disimpan!")
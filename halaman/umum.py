@@ -0,0 +1,104 @@
+import base64
+
+import streamlit as st
+
+import jobs
+import repository as repo
+
+# --- Komponen Bersama Halaman ---
+# Dipakai oleh beberapa modul halaman; tidak mengimpor pustaka grafik.
+
+# --- Lampiran ---
+# Lampiran bersifat content-addressed (SHA-256), jadi cache tidak pernah basi.
+@st.cache_data(max_entries=32, show_spinner=False)
+def ambil_lampiran(sha256):
+    return repo.load_lampiran(sha256)
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def ambil_thumbnail(sha256):
+    return repo.load_thumbnail(sha256)
+
+def thumbnail_uri(sha256):
+    # Hanya thumbnail kecil yang disisipkan ke halaman, bukan file penuh.
+    thumb = ambil_thumbnail(sha256) if sha256 else None
+    return f"data:image/jpeg;base64,{base64.b64encode(thumb).decode()}" if thumb else None
+
+UKURAN_HALAMAN = [10, 25, 50, 100]
+NAMA_BULAN = ["", "Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September",
+              "Oktober", "November", "Desember"]
+
+def pilih_halaman(total, key):
+    # Mengembalikan (limit, offset) untuk halaman yang sedang dipilih.
+    c1, c2 = st.columns(2)
+    ukuran = c1.selectbox("Baris per halaman", UKURAN_HALAMAN, index=1, key=f"{key}_ukuran")
+    jumlah_halaman = max(1, -(-total // ukuran))
+    halaman = c2.number_input(f"Halaman (dari {jumlah_halaman})", 1, jumlah_halaman, 1, key=f"{key}_halaman")
+    return ukuran, (halaman - 1) * ukuran
+
+def tampilkan_lampiran():
+    # File hanya diambil dari database setelah admin menekan "Lihat File".
+    if not st.session_state.get("lampiran_dibuka"):
+        return
+    izin_id, sha256 = st.session_state.lampiran_dibuka
+    lampiran = ambil_lampiran(sha256)
+    st.markdown(f"#### File Persetujuan ID {izin_id}")
+    if lampiran is None:
+        st.warning("File persetujuan tidak ditemukan.")
+    else:
+        data, tipe = lampiran
+        if tipe.startswith("image/"):
+            st.image(data)
+        ext = "png" if tipe == "image/png" else "jpg"
+        st.download_button("Unduh File", data, file_name=f"persetujuan_{izin_id}.{ext}", mime=tipe)
+    if st.button("Tutup File"):
+        st.session_state.lampiran_dibuka = None
+        st.rerun()
+
+def upload_absensi(tahun, bulan, key, boleh_ganti=False):
+    # File diolah oleh worker latar belakang (jobs.py); halaman hanya memantau progres.
+    up = st.file_uploader("Upload Data Absensi Bulanan", type=["xlsx", "csv"], key=f"{key}_file")
+    streaming = st.checkbox("Mode streaming (hemat memori untuk file besar)", key=f"{key}_streaming")
+    ganti = boleh_ganti and st.radio(
+        "Mode impor", ["Tambah / perbarui", "Ganti seluruh bulan"], key=f"{key}_mode"
+    ) == "Ganti seluruh bulan"
+    if up and st.button("Proses File", key=f"{key}_proses"):
+        parameter = {"tahun": int(tahun), "bulan": int(bulan), "nama_file": up.name,
+                     "ganti": bool(ganti), "streaming": bool(streaming)}
+        st.session_state.job_dipantau.append(jobs.kirim("impor_absensi", parameter, data=up.getvalue()))
+        st.rerun()
+
+# --- Job Latar Belakang ---
+JUDUL_JOB = {"impor_absensi": "Impor absensi", "terima_izin": "Accept izin"}
+
+def progres_job(daftar_id):
+    # Fragment: hanya bagian ini yang diulang setiap detik selama job berjalan.
+    for job_id in daftar_id:
+        job = jobs.ambil(job_id)
+        if job is None or job['status'] not in jobs.STATUS_AKTIF:
+            st.rerun()
+        label = f"{JUDUL_JOB.get(job['jenis'], job['jenis'])} #{job_id}"
+        if job['status'] == jobs.STATUS_ANTRI:
+            st.progress(0.0, text=f"{label}: menunggu giliran")
+        elif job['total']:
+            st.progress(min(job['progres'] / job['total'], 1.0), text=f"{label}: {job['progres']}/{job['total']} baris")
+        else:
+            # Mode streaming: jumlah baris baru diketahui setelah file habis dibaca.
+            st.progress(0.0, text=f"{label}: {job['progres']} baris tersimpan")
+
+def pantau_job():
+    # Job yang sudah selesai ditampilkan hasilnya sekali lalu berhenti dipantau.
+    aktif = []
+    for job_id in st.session_state.job_dipantau:
+        job = jobs.ambil(job_id)
+        if job is None:
+            continue
+        label = f"{JUDUL_JOB.get(job['jenis'], job['jenis'])} #{job_id}"
+        if job['status'] in jobs.STATUS_AKTIF:
+            aktif.append(job_id)
+        elif job['status'] == jobs.STATUS_SELESAI:
+            st.success(f"{label}: {job['pesan']}")
+        else:
+            st.error(f"{label}: {job['pesan']}")
+    st.session_state.job_dipantau = aktif
+    if aktif:
+        st.fragment(run_every=jobs.JEDA_POLLING)(progres_job)(aktif)
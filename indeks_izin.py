@@ -0,0 +1,107 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from operator import itemgetter
+
+# --- Indeks Interval Izin ---
+# Struktur di memori untuk izin yang sudah diterima. Tanggal disimpan sebagai
+# teks ISO, jadi perbandingan teks sama dengan perbandingan tanggal.
+#
+# Jumlah izin aktif pada tanggal D = (izin mulai <= D) - (izin selesai < D),
+# keduanya cukup satu bisect pada daftar terurut, tanpa memecah izin per hari.
+#
+# Daftar izin yang aktif diambil dari centered interval tree: setiap simpul
+# punya titik tengah (tanggal mulai izin median), izin yang mencakup
+# titik itu disimpan di simpul tsb (terurut menurut mulai dan menurut
+# selesai), izin yang selesai sebelumnya di subtree kiri dan yang mulai
+# sesudahnya di subtree kanan. Kedalaman pohon O(log n) dan setiap simpul
+# berisi minimal satu izin, sehingga satu pencarian O(log n + k) untuk k izin
+# yang ditemukan, berapa pun panjang izin terlama.
+
+KOLOM = ['id', 'nama', 'divisi', 'jenis_pengajuan', 'tanggal_izin', 'tanggal_selesai', 'jumlah_hari', 'karyawan_id']
+
+
+class _Simpul:
+    __slots__ = ("tengah", "per_mulai", "mulai", "per_selesai", "selesai", "kiri", "kanan")
+
+    def __init__(self, tengah, rows):
+        # rows sudah terurut menurut mulai; per_selesai terurut turun menurut selesai.
+        self.tengah = tengah
+        self.per_mulai = rows
+        self.mulai = [r[4] for r in self.per_mulai]
+        self.per_selesai = sorted(rows, key=itemgetter(5), reverse=True)
+        # Tanggal selesai terurut naik (untuk bisect), kebalikan per_selesai.
+        self.selesai = [r[5] for r in reversed(self.per_selesai)]
+        self.kiri = None
+        self.kanan = None
+
+
+def _bangun(rows, mulai):
+    # rows terurut menurut mulai (mulai = tanggal mulainya); pembagian di bawah
+    # mempertahankan urutan itu.
+    if not rows:
+        return None
+    # Titik tengah = tanggal mulai izin di tengah urutan. Izin itu sendiri
+    # mencakup titik tsb, jadi simpul tidak pernah kosong, dan setiap subtree
+    # paling banyak berisi separuh izin.
+    tengah = mulai[len(rows) // 2]
+    batas = bisect_right(mulai, tengah)
+    sebelum = rows[:batas]
+    kiri = [r for r in sebelum if r[5] < tengah]
+    simpul = _Simpul(tengah, [r for r in sebelum if r[5] >= tengah])
+    simpul.kiri = _bangun(kiri, [r[4] for r in kiri])
+    simpul.kanan = _bangun(rows[batas:], mulai[batas:])
+    return simpul
+
+
+class IndeksIzin:
+    def __init__(self, rows):
+        # rows: tuple sesuai KOLOM, tanggal_selesai tidak boleh None.
+        rows = list(rows)
+        self.jumlah = len(rows)
+        urut = sorted(rows, key=itemgetter(4, 0))
+        self.mulai = [r[4] for r in urut]
+        self.selesai = sorted(r[5] for r in rows)
+        self.akar = _bangun(urut, self.mulai)
+
+    def __len__(self):
+        return self.jumlah
+
+    def jumlah_pada(self, tanggal):
+        return bisect_right(self.mulai, tanggal) - bisect_left(self.selesai, tanggal)
+
+    def jumlah_dalam(self, awal, akhir):
+        # Izin yang beririsan dengan [awal, akhir].
+        return bisect_right(self.mulai, akhir) - bisect_left(self.selesai, awal)
+
+    def pada(self, tanggal):
+        # Izin yang aktif pada tanggal.
+        return self.dalam(tanggal, tanggal)
+
+    def dalam(self, awal, akhir):
+        # Izin yang beririsan dengan [awal, akhir], terurut menurut tanggal mulai.
+        hasil = []
+        tumpukan = [self.akar]
+        while tumpukan:
+            simpul = tumpukan.pop()
+            if simpul is None:
+                continue
+            if akhir < simpul.tengah:
+                # Semua izin di simpul selesai >= tengah > akhir: cukup mulai <= akhir.
+                hasil += simpul.per_mulai[:bisect_right(simpul.mulai, akhir)]
+                tumpukan.append(simpul.kiri)
+            elif awal > simpul.tengah:
+                # Semua izin di simpul mulai <= tengah < awal: cukup selesai >= awal.
+                hasil += simpul.per_selesai[:len(simpul.selesai) - bisect_left(simpul.selesai, awal)]
+                tumpukan.append(simpul.kanan)
+            else:
+                hasil += simpul.per_mulai
+                tumpukan.append(simpul.kiri)
+                tumpukan.append(simpul.kanan)
+        hasil.sort(key=itemgetter(4, 0))
+        return hasil
+
+    def jumlah_per_tanggal(self, awal, akhir):
+        # {tanggal: jumlah izin aktif} untuk setiap hari di [awal, akhir].
+        mulai = date.fromisoformat(awal)
+        hari = (date.fromisoformat(akhir) - mulai).days + 1
+        return {t: self.jumlah_pada(t) for t in ((mulai + timedelta(days=i)).isoformat() for i in range(hari))}
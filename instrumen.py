@@ -0,0 +1,398 @@
+import argparse
+import bisect
+import cProfile
+import io
+import json
+import logging
+import logging.handlers
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# --- Instrumentasi Rerun ---
+# Opsional, per rerun: mencatat waktu bagian-bagian halaman (query SQL beserta
+# teks dan jumlah barisnya, transformasi pandas, render grafik/kalender, byte
+# BLOB yang dibaca/ditulis). Rekaman disimpan di thread lokal, karena setiap
+# rerun Streamlit berjalan di thread script miliknya sendiri; thread lain
+# (mis. worker job) tidak ikut tercatat. Tanpa rekaman aktif, setiap titik
+# ukur hanya memeriksa thread lokal.
+#
+# Setiap rerun yang tercatat ditulis sebagai satu baris JSON ke INSTRUMEN_LOG
+# (dirotasi per INSTRUMEN_LOG_MB). Aktif untuk semua sesi jika INSTRUMEN=1,
+# atau per sesi admin lewat panel di sidebar.
+#
+# Mode profil (satu rerun) juga menjalankan cProfile dan tracemalloc, lalu
+# menyimpan file .prof di INSTRUMEN_DIR. File .prof bisa dibuka dengan
+# snakeviz atau diubah menjadi flamegraph dengan flameprof/gprof2dot.
+# tracemalloc berlaku untuk seluruh proses, jadi sesi lain yang berjalan
+# bersamaan ikut terhitung dalam angka memori.
+#
+#   python instrumen.py ringkas            p50/p95 per menu dari log
+#   python instrumen.py lambat --top 20    bagian paling lambat
+
+AKTIF = os.environ.get("INSTRUMEN", "") == "1"
+INSTRUMEN_DIR = os.environ.get("INSTRUMEN_DIR", "instrumen")
+INSTRUMEN_LOG = os.environ.get("INSTRUMEN_LOG", os.path.join(INSTRUMEN_DIR, "rerun.jsonl"))
+LOG_MAKS_BYTES = int(os.environ.get("INSTRUMEN_LOG_MB", "5")) * 1024 * 1024
+LOG_CADANGAN = 3
+
+PANJANG_SQL = 300
+JENIS = ("sql", "cache", "pandas", "render", "blob", "bagian")
+
+_lokal = threading.local()
+
+
+def ringkas_sql(sql):
+    sql = re.sub(r"\s+", " ", sql).strip()
+    return sql if len(sql) <= PANJANG_SQL else sql[:PANJANG_SQL] + "..."
+
+
+class Rekaman:
+    def __init__(self, menu, profil=False):
+        self.menu = menu
+        self.waktu = datetime.now().isoformat(timespec="seconds")
+        self.entri = []
+        self.kedalaman = 0
+        self.total_ms = None
+        self.profil = None
+        self._t0 = time.perf_counter()
+        self._profiler = None
+        if profil:
+            self._mulai_profil()
+
+    def tambah(self, jenis, nama, **info):
+        entri = dict(jenis=jenis, nama=nama, kedalaman=self.kedalaman, ms=0.0, **info)
+        self.entri.append(entri)
+        return entri
+
+    def ringkasan(self):
+        # Total per jenis; hanya entri terluar dari jenis tsb agar tidak dihitung dua kali.
+        hasil = {j: {"jumlah": 0, "ms": 0.0, "baris": 0, "bytes": 0} for j in JENIS}
+        terbuka = {}
+        for e in self.entri:
+            for j in [j for j, d in terbuka.items() if d >= e["kedalaman"]]:
+                del terbuka[j]
+            h = hasil[e["jenis"]]
+            h["jumlah"] += 1
+            h["baris"] += e.get("baris", 0)
+            h["bytes"] += e.get("bytes", 0)
+            if e["jenis"] not in terbuka:
+                h["ms"] += e["ms"]
+                terbuka[e["jenis"]] = e["kedalaman"]
+        return {j: h for j, h in hasil.items() if h["jumlah"]}
+
+    def ke_dict(self):
+        return {"waktu": self.waktu, "menu": self.menu, "total_ms": round(self.total_ms or 0.0, 2),
+                "ringkasan": {j: {k: round(v, 2) for k, v in h.items()} for j, h in self.ringkasan().items()},
+                "entri": [{k: round(v, 2) if isinstance(v, float) else v for k, v in e.items()} for e in self.entri]}
+
+    # --- Profil satu rerun ---
+
+    def _mulai_profil(self):
+        self._profiler = cProfile.Profile()
+        try:
+            self._profiler.enable()
+        except ValueError as e:
+            # Profiler lain (mis. sesi admin lain) sedang aktif di proses ini.
+            self._profiler = None
+            self.profil = {"galat": str(e)}
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_sendiri = True
+        else:
+            self._tracemalloc_sendiri = False
+
+    def _selesai_profil(self):
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, puncak = tracemalloc.get_traced_memory()
+        if self._tracemalloc_sendiri:
+            tracemalloc.stop()
+
+        os.makedirs(INSTRUMEN_DIR, exist_ok=True)
+        menu = re.sub(r"\W+", "_", self.menu)
+        dasar = os.path.join(INSTRUMEN_DIR, f"profil-{datetime.now():%Y%m%d-%H%M%S}-{menu}")
+        self._profiler.dump_stats(f"{dasar}.prof")
+        teks = io.StringIO()
+        pstats.Stats(self._profiler, stream=teks).sort_stats("cumulative").print_stats(30)
+        teks.write(f"\nMemori puncak (tracemalloc): {puncak / 1024 / 1024:.1f} MB\n")
+        for stat in snapshot.statistics("lineno")[:20]:
+            teks.write(f"{stat}\n")
+        with open(f"{dasar}.txt", "w", encoding="utf-8") as f:
+            f.write(teks.getvalue())
+        self.profil = {"prof": f"{dasar}.prof", "teks": teks.getvalue(), "memori_puncak_mb": puncak / 1024 / 1024}
+        self._profiler = None
+
+
+def sedang_merekam():
+    return getattr(_lokal, "rekaman", None)
+
+
+def mulai(menu, aktif=True, profil=False):
+    # Dipanggil setiap rerun. Rekaman rerun sebelumnya yang terputus (st.rerun,
+    # st.stop) dibuang di sini agar tidak terus terisi.
+    lama = sedang_merekam()
+    if lama is not None:
+        lama._selesai_profil()
+    _lokal.rekaman = Rekaman(menu, profil) if aktif or profil else None
+    return _lokal.rekaman
+
+
+def selesai():
+    rek = sedang_merekam()
+    if rek is None:
+        return None
+    _lokal.rekaman = None
+    rek.total_ms = (time.perf_counter() - rek._t0) * 1000
+    rek._selesai_profil()
+    tulis_log(rek)
+    return rek
+
+
+@contextmanager
+def bagian(nama, jenis="bagian", **info):
+    rek = sedang_merekam()
+    if rek is None:
+        yield None
+        return
+    entri = rek.tambah(jenis, nama, **info)
+    rek.kedalaman += 1
+    t0 = time.perf_counter()
+    try:
+        yield entri
+    finally:
+        entri["ms"] += (time.perf_counter() - t0) * 1000
+        rek.kedalaman -= 1
+
+
+def blob(nama, jumlah_bytes):
+    rek = sedang_merekam()
+    if rek is not None:
+        rek.tambah("blob", nama, bytes=jumlah_bytes)
+
+
+# --- Koneksi Terukur ---
+# Dipasang oleh repository.koneksi() hanya saat ada rekaman. Waktu execute dan
+# fetch dijumlahkan ke entri SQL yang sama.
+
+class KursorTerukur:
+    def __init__(self, cursor, entri):
+        self._cursor = cursor
+        self._entri = entri
+
+    def _ambil(self, fn, *args):
+        t0 = time.perf_counter()
+        hasil = fn(*args)
+        self._entri["ms"] += (time.perf_counter() - t0) * 1000
+        return hasil
+
+    def fetchone(self):
+        row = self._ambil(self._cursor.fetchone)
+        self._entri["baris"] += row is not None
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._ambil(self._cursor.fetchmany, *([size] if size is not None else []))
+        self._entri["baris"] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._ambil(self._cursor.fetchall)
+        self._entri["baris"] += len(rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __getattr__(self, nama):
+        return getattr(self._cursor, nama)
+
+
+class KoneksiTerukur:
+    def __init__(self, conn, rek):
+        self.asli = conn
+        self._rek = rek
+
+    def _jalankan(self, fn, sql, params):
+        entri = self._rek.tambah("sql", ringkas_sql(sql), baris=0)
+        t0 = time.perf_counter()
+        cursor = fn(sql, params)
+        entri["ms"] += (time.perf_counter() - t0) * 1000
+        # Untuk INSERT/UPDATE/DELETE, rowcount = baris yang berubah.
+        entri["baris"] = max(cursor.rowcount, 0)
+        return KursorTerukur(cursor, entri)
+
+    def execute(self, sql, params=()):
+        return self._jalankan(self.asli.execute, sql, params)
+
+    def executemany(self, sql, params):
+        return self._jalankan(self.asli.executemany, sql, params)
+
+    def __getattr__(self, nama):
+        return getattr(self.asli, nama)
+
+
+def bungkus(conn):
+    rek = sedang_merekam()
+    return conn if rek is None else KoneksiTerukur(conn, rek)
+
+
+def asli(conn):
+    # Koneksi sqlite3 aslinya, untuk pustaka yang memeriksa tipe (pandas).
+    return conn.asli if isinstance(conn, KoneksiTerukur) else conn
+
+
+# --- Log JSONL ---
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _get_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            os.makedirs(os.path.dirname(INSTRUMEN_LOG) or ".", exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(INSTRUMEN_LOG, maxBytes=LOG_MAKS_BYTES,
+                                                           backupCount=LOG_CADANGAN, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("instrumen")
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            _logger.addHandler(handler)
+        return _logger
+
+
+def tulis_log(rek):
+    try:
+        _get_logger().info(json.dumps(rek.ke_dict(), ensure_ascii=False))
+    except OSError:
+        pass
+
+
+def _file_cadangan(path):
+    # File rotasi yang ada, dari yang terlama.
+    return [p for p in (f"{path}.{i}" for i in range(LOG_CADANGAN, 0, -1)) if os.path.exists(p)]
+
+
+def baca_log(path=None):
+    # Semua rerun di log aktif dan file rotasinya, dari yang terlama.
+    path = path or INSTRUMEN_LOG
+    hasil = []
+    for p in _file_cadangan(path) + [path]:
+        if not os.path.exists(p):
+            continue
+        with open(p, encoding="utf-8") as f:
+            for baris in f:
+                try:
+                    hasil.append(json.loads(baris))
+                except ValueError:
+                    continue
+    return hasil
+
+
+def _persentil(nilai, p):
+    nilai = sorted(nilai)
+    k = (len(nilai) - 1) * p / 100
+    bawah = int(k)
+    atas = min(bawah + 1, len(nilai) - 1)
+    return nilai[bawah] + (nilai[atas] - nilai[bawah]) * (k - bawah)
+
+
+# --- Statistik per Menu ---
+# Panel sidebar memanggil statistik_menu setiap rerun. Sampel total_ms per
+# menu disimpan di memori (terurut), dan setiap pemanggilan hanya membaca
+# byte yang ditambahkan ke log aktif sejak pemanggilan sebelumnya, termasuk
+# yang ditulis proses lain. Seluruh log (beserta file rotasinya) hanya dibaca
+# saat pertama kali dan setelah log dirotasi.
+
+class _StatistikLog:
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.per_menu = {}
+        self.hasil = []
+
+    def _tambah(self, baris):
+        try:
+            r = json.loads(baris)
+        except ValueError:
+            return
+        bisect.insort(self.per_menu.setdefault(r["menu"], []), r["total_ms"])
+
+    def perbarui(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+        berubah = False
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # Pertama kali, atau file aktif sudah diganti file baru oleh rotasi.
+            self.inode, self.offset, self.per_menu = st.st_ino, 0, {}
+            for p in _file_cadangan(self.path):
+                with open(p, "rb") as f:
+                    for baris in f:
+                        self._tambah(baris)
+            berubah = True
+        if st.st_size > self.offset:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+            # Baris terakhir yang belum lengkap (masih ditulis) dibaca pada pemanggilan berikutnya.
+            lengkap = data.rfind(b"\n") + 1
+            for baris in data[:lengkap].splitlines():
+                self._tambah(baris)
+            self.offset += lengkap
+            berubah = berubah or lengkap > 0
+        if berubah:
+            self.hasil = [(m, len(v), _persentil(v, 50), _persentil(v, 95), v[-1])
+                          for m, v in sorted(self.per_menu.items())]
+        return self.hasil
+
+
+_statistik = {}
+_statistik_lock = threading.Lock()
+
+
+def statistik_menu(path=None):
+    # [(menu, n, p50_ms, p95_ms, maks_ms)] dari seluruh log dan file rotasinya.
+    path = path or INSTRUMEN_LOG
+    with _statistik_lock:
+        if path not in _statistik:
+            _statistik[path] = _StatistikLog(path)
+        return _statistik[path].perbarui()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="instrumen.py")
+    parser.add_argument("perintah", choices=["ringkas", "lambat"])
+    parser.add_argument("--log", default=INSTRUMEN_LOG)
+    parser.add_argument("--menu", help="hanya rerun menu ini")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.perintah == "ringkas":
+        print(f"{'menu':<24}{'n':>6}{'p50 (ms)':>11}{'p95 (ms)':>11}{'maks (ms)':>11}")
+        for menu, n, p50, p95, maks in statistik_menu(args.log):
+            print(f"{menu:<24}{n:>6}{p50:>11.1f}{p95:>11.1f}{maks:>11.1f}")
+        return 0
+
+    entri = [(e["ms"], r["menu"], e["jenis"], e["nama"], e.get("baris", ""))
+             for r in baca_log(args.log) if args.menu in (None, r["menu"]) for e in r["entri"]]
+    for ms, menu, jenis, nama, baris in sorted(entri, reverse=True)[:args.top]:
+        print(f"{ms:>10.1f} ms  {menu:<20}{jenis:<8}{baris!s:>8}  {nama}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+import argparse
+import io
+import itertools
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+
+import pandas as pd
+
+import instrumen
+import presensi
+import repository as repo
+
+# --- Antrean Job Latar Belakang ---
+# Impor absensi dan Accept izin dikerjakan oleh satu thread worker per proses,
+# bukan di thread script Streamlit. Job disimpan di tabel jobs (migrasi 9)
+# sehingga tetap ada setelah proses restart: job "Berjalan" yang tidak lagi
+# diperbarui selama BATAS_MACET detik dianggap ditinggal dan diambil ulang.
+#
+# Setiap proses Streamlit dan setiap "python jobs.py" menjalankan worker
+# sendiri. Worker yang mengklaim job menjadi pemiliknya (kolom pemilik,
+# migrasi 13) dan selama job berjalan sebuah thread detak memperbarui kolom
+# diperbarui setiap JEDA_DETAK detik, termasuk saat membaca file atau
+# menghitung ulang ringkasan yang lama. Sebelum setiap batch, pemilik dicek
+# ulang; worker yang kehilangan job (mis. proses sempat membeku lebih dari
+# BATAS_MACET) berhenti tanpa menulis apa pun lagi. Jadi satu job hanya
+# dikerjakan oleh satu worker pada satu waktu, di proses mana pun. Lease ini
+# tidak membatasi jumlah penulis: N proses bisa mengerjakan N job berbeda
+# sekaligus, dan transaksinya bergantian menunggu kunci tulis SQLite.
+#
+# Impor ditulis per UKURAN_BATCH baris, masing-masing dalam transaksi pendek,
+# sehingga penulisan lain (mis. pengajuan izin) tidak menunggu lama.
+# progres dicatat setelah batch ter-commit; saat dilanjutkan, baris yang sudah
+# tersimpan dilewati. Paling buruk satu batch ditulis dua kali, dan itu aman
+# karena penyimpanan absensi berupa upsert.
+#
+# Impor "ganti bulan" menampung batch di impor_staging; bulan lama dihapus dan
+# diganti dalam satu transaksi di akhir, jadi tetap atomik. Impor tambahan
+# menulis batch langsung ke absensi; jika gagal di tengah jalan, batch yang
+# sudah tersimpan tetap ada dan ringkasan/rekap bulan itu tetap dihitung ulang.
+#
+#   python jobs.py           jalankan worker di foreground
+#   python jobs.py list      tampilkan job terakhir
+
+STATUS_ANTRI = "Antri"
+STATUS_BERJALAN = "Berjalan"
+STATUS_SELESAI = "Selesai"
+STATUS_GAGAL = "Gagal"
+STATUS_AKTIF = (STATUS_ANTRI, STATUS_BERJALAN)
+
+UKURAN_BATCH = 5000
+JEDA_POLLING = 1.0
+BATAS_MACET = 120
+JEDA_DETAK = BATAS_MACET / 4
+
+KOLOM_JOB = "id, jenis, parameter, status, progres, total, pesan, dibuat, diperbarui"
+
+_handler = {}
+
+
+def handler(jenis):
+    def deco(fn):
+        _handler[jenis] = fn
+        return fn
+    return deco
+
+
+def kirim(jenis, parameter, data=None):
+    # Masukkan job ke antrean; worker dibangunkan agar segera mengambilnya.
+    if jenis not in _handler:
+        raise ValueError(f"Jenis job tidak dikenal: {jenis}")
+    if data is not None:
+        instrumen.blob(f"data job {jenis}", len(data))
+    with repo.transaksi() as conn:
+        job_id = conn.execute("INSERT INTO jobs (jenis, parameter, data) VALUES (?, ?, ?)",
+                              (jenis, json.dumps(parameter), data)).lastrowid
+    _ada_job.set()
+    return job_id
+
+
+def ambil(job_id):
+    with repo.koneksi() as conn:
+        row = conn.execute(f"SELECT {KOLOM_JOB} FROM jobs WHERE id = ?", (int(job_id),)).fetchone()
+    if row is None:
+        return None
+    job = dict(zip([k.strip() for k in KOLOM_JOB.split(",")], row))
+    job["parameter"] = json.loads(job["parameter"])
+    return job
+
+
+def daftar(limit=20):
+    return repo.read_df(f"SELECT {KOLOM_JOB} FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+
+
+def parameter_aktif(jenis):
+    # Parameter job jenis ini yang masih antre atau berjalan.
+    with repo.koneksi() as conn:
+        rows = conn.execute("SELECT parameter FROM jobs WHERE jenis = ? AND status IN (?, ?)",
+                            (jenis, *STATUS_AKTIF)).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+class LeaseHilang(Exception):
+    # Job ini sudah diklaim worker lain.
+    pass
+
+
+def _klaim(job_id=None):
+    # Ambil satu job secara atomik: yang antre, atau yang berjalan tapi macet.
+    # Mengembalikan (id, pemilik) atau None.
+    pemilik = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(8)}"
+    sql = "SELECT id FROM jobs WHERE (status = ? OR (status = ? AND diperbarui < datetime('now', ?)))"
+    params = [STATUS_ANTRI, STATUS_BERJALAN, f"-{BATAS_MACET} seconds"]
+    if job_id is not None:
+        sql += " AND id = ?"
+        params.append(int(job_id))
+    with repo.transaksi() as conn:
+        row = conn.execute(f"{sql} ORDER BY id LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE jobs SET status = ?, pemilik = ?, diperbarui = datetime('now') WHERE id = ?",
+                     (STATUS_BERJALAN, pemilik, row[0]))
+    return row[0], pemilik
+
+
+def _catat(job_id, pemilik, **kolom):
+    # False jika job bukan lagi milik pemilik ini (tidak ada yang ditulis).
+    sets = ", ".join(f"{k} = ?" for k in kolom)
+    with repo.transaksi() as conn:
+        cur = conn.execute(f"UPDATE jobs SET {sets}, diperbarui = datetime('now') WHERE id = ? AND pemilik = ?",
+                           (*kolom.values(), job_id, pemilik))
+    return cur.rowcount > 0
+
+
+class Detak(threading.Thread):
+    # Memperbarui jobs.diperbarui selama job berjalan agar tidak dianggap macet.
+    def __init__(self, job_id, pemilik, jeda=None):
+        super().__init__(name=f"jobs-detak-{job_id}", daemon=True)
+        self.job_id = job_id
+        self.pemilik = pemilik
+        self.jeda = jeda or JEDA_DETAK
+        self.berhenti = threading.Event()
+        self.hilang = threading.Event()
+
+    def run(self):
+        while not self.berhenti.wait(self.jeda):
+            try:
+                with repo.transaksi() as conn:
+                    ada = conn.execute("UPDATE jobs SET diperbarui = datetime('now') "
+                                       "WHERE id = ? AND pemilik = ? AND status = ?",
+                                       (self.job_id, self.pemilik, STATUS_BERJALAN)).rowcount
+            except Exception:
+                # Mis. database sedang terkunci lama; dicoba lagi pada detak berikutnya.
+                continue
+            if not ada:
+                self.hilang.set()
+                return
+
+
+def jalankan(job_id, pemilik=None):
+    # Kerjakan satu job. Tanpa pemilik, job ini diklaim dulu (mis. dari
+    # benchmark). False jika job dikerjakan atau diambil alih worker lain.
+    if pemilik is None:
+        klaim = _klaim(job_id)
+        if klaim is None:
+            return False
+        pemilik = klaim[1]
+    with repo.koneksi() as conn:
+        jenis, parameter, data, progres = conn.execute(
+            "SELECT jenis, parameter, data, progres FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    detak = Detak(job_id, pemilik)
+    detak.start()
+
+    def lapor(selesai, total=None):
+        # Dipanggil setelah setiap batch, jadi juga menjadi cek pemilik sebelum batch berikutnya.
+        if detak.hilang.is_set() or not _catat(job_id, pemilik, progres=selesai, total=total):
+            raise LeaseHilang(job_id)
+
+    try:
+        pesan = _handler[jenis](job_id, json.loads(parameter), data, progres, lapor)
+    except LeaseHilang:
+        # Status dan hasil job kini urusan worker yang mengambil alih.
+        return False
+    except ValueError as e:
+        _catat(job_id, pemilik, status=STATUS_GAGAL, pesan=str(e), data=None)
+    except Exception as e:
+        _catat(job_id, pemilik, status=STATUS_GAGAL, pesan=f"{type(e).__name__}: {e}", data=None)
+    else:
+        # File upload tidak diperlukan lagi setelah job selesai.
+        _catat(job_id, pemilik, status=STATUS_SELESAI, pesan=pesan, data=None)
+    finally:
+        detak.berhenti.set()
+    return True
+
+
+# --- Jenis Job ---
+
+@handler("impor_absensi")
+def _impor_absensi(job_id, p, data, sudah, lapor):
+    # p: tahun, bulan, nama_file, ganti, streaming. sudah: baris yang tersimpan
+    # pada percobaan sebelumnya.
+    tahun, bulan = p["tahun"], p["bulan"]
+    mapping = repo.load_karyawan().set_index("ID")["Divisi"].to_dict()
+    is_csv = p["nama_file"].lower().endswith(".csv")
+    total = None
+    if p["streaming"]:
+        chunks = presensi.chunk_csv(io.BytesIO(data)) if is_csv else presensi.chunk_xlsx(io.BytesIO(data))
+        rows = presensi.stream_presensi(chunks, mapping, tahun, bulan)
+    else:
+        df_in = pd.read_csv(io.BytesIO(data)) if is_csv else pd.read_excel(io.BytesIO(data))
+        rows = presensi.ke_baris_absensi(presensi.format_presensi_data(df_in, mapping), tahun, bulan)
+        total = len(rows)
+    rows = itertools.islice(rows, sudah, None)
+
+    selesai = sudah
+    try:
+        while True:
+            batch = list(itertools.islice(rows, UKURAN_BATCH))
+            if not batch:
+                break
+            if p["ganti"]:
+                repo.simpan_staging(job_id, batch)
+            else:
+                repo.save_absensi(batch, refresh=False)
+            selesai += len(batch)
+            lapor(selesai, total)
+        if selesai == 0:
+            raise ValueError("Data dalam file tidak valid.")
+        if p["ganti"]:
+            repo.ganti_absensi_bulan(job_id, tahun, bulan)
+        else:
+            # Ringkasan harian dan rekap bulanan dihitung sekali di akhir, bukan per batch.
+            repo.refresh_bulan(tahun, bulan)
+    except LeaseHilang:
+        # Staging dan bulan ini sekarang dipegang worker lain.
+        raise
+    except Exception:
+        if p["ganti"]:
+            repo.hapus_staging(job_id)
+        elif selesai:
+            repo.refresh_bulan(tahun, bulan)
+        raise
+    return f"{selesai} baris absensi {tahun}-{bulan:02d} tersimpan."
+
+
+@handler("terima_izin")
+def _terima_izin(job_id, p, data, sudah, lapor):
+    try:
+        diterima = repo.terima_izin(p["izin_id"])
+    except (TypeError, ValueError):
+        raise ValueError("Format tanggal izin tidak valid.")
+    lapor(1, 1)
+    return f"ID {p['izin_id']} diterima." if diterima else f"ID {p['izin_id']} tidak lagi Pending."
+
+
+# --- Worker ---
+
+_ada_job = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+class Worker(threading.Thread):
+    def __init__(self):
+        super().__init__(name="jobs-worker", daemon=True)
+        self.berhenti = threading.Event()
+
+    def run(self):
+        while not self.berhenti.is_set():
+            try:
+                klaim = _klaim()
+            except Exception:
+                klaim = None
+            if klaim is None:
+                _ada_job.wait(JEDA_POLLING)
+                _ada_job.clear()
+                continue
+            jalankan(*klaim)
+
+    def stop(self):
+        self.berhenti.set()
+        _ada_job.set()
+
+
+def mulai_worker():
+    # Satu worker per proses; pemanggilan berikutnya mengembalikan worker yang sama.
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = Worker()
+            _worker.start()
+        return _worker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="jobs.py")
+    parser.add_argument("perintah", nargs="?", choices=["run", "list"], default="run")
+    args = parser.parse_args(argv)
+
+    repo.init_db()
+    if args.perintah == "list":
+        print(daftar().to_string(index=False))
+        return 0
+    worker = mulai_worker()
+    try:
+        while worker.is_alive():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        worker.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import argparse
+import calendar
+import sys
+
+import ringkasan
+
+# --- Rekap Bulanan ---
+# Tabel rekap_bulanan menyimpan satu baris per bulan per karyawan: hari hadir,
+# hari telat, rata-rata menit kedatangan, dan hari izin per jenis_pengajuan.
+# Baris yang punya karyawan_id dikelompokkan menurut id (beda ejaan nama tetap
+# satu karyawan, nama diambil dari tabel karyawan); baris lama yang belum
+# punya id tetap dikelompokkan menurut nama.
+# Dihitung dengan satu query ter-group per bulan dan diperbarui oleh write path
+# di repository untuk bulan (dan bila bisa, karyawan) yang tersentuh saja.
+# Rekap per divisi diturunkan dari tabel ini.
+#
+#   python laporan.py rebuild
+#   python laporan.py export 2024-01 2024-12 rekap.csv [--divisi]
+
+SQL_REKAP = '''
+    WITH per_sumber AS (
+        SELECT karyawan_id, nama, divisi,
+               lower(status) IN ('tepat waktu', 'telat') AS hadir,
+               lower(status) = 'telat' AS telat,
+               CASE WHEN lower(status) IN ('tepat waktu', 'telat') AND jam_masuk GLOB '[0-9][0-9]:[0-9][0-9]*'
+                    THEN CAST(substr(jam_masuk, 1, 2) AS INTEGER) * 60 + CAST(substr(jam_masuk, 4, 2) AS INTEGER)
+               END AS menit_datang,
+               NULL AS jenis_pengajuan, 0 AS hari
+        FROM absensi
+        WHERE tanggal >= :awal AND tanggal <= :akhir
+          AND ((:karyawan_id IS NULL AND :nama IS NULL) OR karyawan_id = :karyawan_id
+               OR (karyawan_id IS NULL AND nama = :nama))
+        UNION ALL
+        -- Hari izin dipotong ke dalam bulan: izin yang melewati batas bulan
+        -- terbagi ke bulan-bulan yang dicakupnya.
+        SELECT karyawan_id, nama, divisi, 0, 0, NULL, jenis_pengajuan,
+               CAST(julianday(min(tanggal_selesai, :akhir)) - julianday(max(tanggal_izin, :awal)) + 1 AS INTEGER)
+        FROM izin
+        WHERE status = :diterima AND tanggal_izin <= :akhir AND tanggal_selesai >= :awal
+          AND ((:karyawan_id IS NULL AND :nama IS NULL) OR karyawan_id = :karyawan_id
+               OR (karyawan_id IS NULL AND nama = :nama))
+    )
+    SELECT :bulan, s.karyawan_id, COALESCE(MAX(k.Nama), MAX(s.nama), CAST(s.karyawan_id AS TEXT)), MAX(s.divisi),
+           COALESCE(SUM(hadir), 0), COALESCE(SUM(telat), 0), AVG(menit_datang),
+           SUM(CASE WHEN jenis_pengajuan = 'Cuti' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'Sakit' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'WFH' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'Telat' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan NOT IN ('Cuti', 'Sakit', 'WFH', 'Telat') THEN hari ELSE 0 END)
+    FROM per_sumber s LEFT JOIN karyawan k ON k.ID = s.karyawan_id
+    WHERE s.karyawan_id IS NOT NULL OR s.nama IS NOT NULL
+    GROUP BY s.karyawan_id, CASE WHEN s.karyawan_id IS NULL THEN s.nama END
+'''
+
+KOLOM_REKAP = ["bulan", "karyawan_id", "nama", "divisi", "hari_hadir", "hari_telat", "rata_menit_datang",
+               "cuti", "sakit", "wfh", "izin_telat", "izin_lain"]
+
+KOLOM_JUMLAH = ["hari_hadir", "hari_telat", "cuti", "sakit", "wfh", "izin_telat", "izin_lain"]
+
+
+def sql_rollup(per_divisi=False, per_bulan=True):
+    # Agregasi rekap_bulanan untuk rentang bulan [?, ?]. Rata-rata menit datang
+    # ditimbang dengan jumlah hari hadir tiap baris.
+    if per_divisi:
+        kunci = urut = ["COALESCE(divisi, 'No Data')"]
+        kolom = ["COALESCE(divisi, 'No Data') AS divisi",
+                 "COUNT(DISTINCT karyawan_id) + COUNT(DISTINCT CASE WHEN karyawan_id IS NULL THEN nama END) "
+                 "AS karyawan"]
+    else:
+        kunci = ["karyawan_id", "CASE WHEN karyawan_id IS NULL THEN nama END"]
+        urut = ["nama", "karyawan_id"]
+        kolom = ["karyawan_id", "MAX(nama) AS nama", "MAX(divisi) AS divisi"]
+    if per_bulan:
+        kunci = ["bulan", *kunci]
+        urut = ["bulan", *urut]
+        kolom = ["bulan", *kolom]
+    jumlah = [f"SUM({k}) AS {k}" for k in KOLOM_JUMLAH]
+    jumlah.insert(2, "ROUND(SUM(rata_menit_datang * hari_hadir) / "
+                     "NULLIF(SUM(CASE WHEN rata_menit_datang IS NOT NULL THEN hari_hadir END), 0), 1) "
+                     "AS rata_menit_datang")
+    return (f"SELECT {', '.join(kolom + jumlah)} FROM rekap_bulanan WHERE bulan >= ? AND bulan <= ? "
+            f"GROUP BY {', '.join(kunci)} ORDER BY {', '.join(urut)}")
+
+
+def batas_bulan(bulan):
+    # "YYYY-MM" -> (tanggal pertama, tanggal terakhir) inklusif.
+    tahun, bln = int(bulan[:4]), int(bulan[5:7])
+    return f"{bulan}-01", f"{bulan}-{calendar.monthrange(tahun, bln)[1]:02d}"
+
+
+def bulan_antara(mulai, selesai):
+    # Semua "YYYY-MM" dari tanggal mulai s.d. tanggal selesai (ISO).
+    tahun, bln = int(mulai[:4]), int(mulai[5:7])
+    hasil = []
+    while f"{tahun}-{bln:02d}" <= selesai[:7]:
+        hasil.append(f"{tahun}-{bln:02d}")
+        tahun, bln = (tahun + 1, 1) if bln == 12 else (tahun, bln + 1)
+    return hasil
+
+
+def refresh_bulan(conn, bulan, karyawan_id=None, nama=None):
+    # Hitung ulang rekap satu bulan, atau hanya satu karyawan di bulan itu:
+    # baris rekap karyawan_id tsb dan/atau baris rekap nama tanpa id.
+    awal, akhir = batas_bulan(bulan)
+    if karyawan_id is None and nama is None:
+        conn.execute("DELETE FROM rekap_bulanan WHERE bulan = ?", (bulan,))
+    else:
+        conn.execute("DELETE FROM rekap_bulanan WHERE bulan = ? AND (karyawan_id = ? "
+                     "OR (karyawan_id IS NULL AND nama = ?))", (bulan, karyawan_id, nama))
+    conn.execute(f"INSERT INTO rekap_bulanan ({', '.join(KOLOM_REKAP)}) {SQL_REKAP}",
+                 {"bulan": bulan, "awal": awal, "akhir": akhir, "karyawan_id": karyawan_id, "nama": nama,
+                  "diterima": ringkasan.STATUS_DITERIMA})
+
+
+def semua_bulan(conn):
+    bulan = {r[0] for r in conn.execute("SELECT DISTINCT substr(tanggal, 1, 7) FROM absensi "
+                                        "WHERE tanggal IS NOT NULL")}
+    # Izin yang melewati akhir bulan juga menyentuh bulan berikutnya.
+    for mulai, selesai in conn.execute("SELECT DISTINCT tanggal_izin, tanggal_selesai FROM izin "
+                                       "WHERE status = ? AND tanggal_selesai >= tanggal_izin",
+                                       (ringkasan.STATUS_DITERIMA,)):
+        bulan.update(bulan_antara(mulai, selesai))
+    return sorted(b for b in bulan if len(b) == 7)
+
+
+def rebuild(conn):
+    # Dipanggil di dalam transaksi milik pemanggil.
+    conn.execute("DELETE FROM rekap_bulanan")
+    for bulan in semua_bulan(conn):
+        refresh_bulan(conn, bulan)
+
+
+def main(argv=None):
+    import repository as repo
+
+    parser = argparse.ArgumentParser(prog="laporan.py")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    sub.add_parser("rebuild")
+    ekspor = sub.add_parser("export")
+    ekspor.add_argument("awal", help="bulan awal, YYYY-MM")
+    ekspor.add_argument("akhir", help="bulan akhir, YYYY-MM")
+    ekspor.add_argument("file", help="tujuan .csv atau .parquet")
+    ekspor.add_argument("--divisi", action="store_true", help="rekap per divisi")
+    args = parser.parse_args(argv)
+
+    repo.init_db()
+    if args.perintah == "rebuild":
+        with repo.transaksi() as conn:
+            rebuild(conn)
+            jumlah = conn.execute("SELECT COUNT(*) FROM rekap_bulanan").fetchone()[0]
+        print(f"rekap_bulanan dibangun ulang: {jumlah} baris")
+        return 0
+    df = repo.load_rekap(args.awal, args.akhir, per_divisi=args.divisi)
+    if args.file.endswith(".parquet"):
+        df.to_parquet(args.file, index=False)
+    else:
+        df.to_csv(args.file, index=False)
+    print(f"{len(df)} baris ditulis ke {args.file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+import base64
+import hashlib
+import secrets
+from datetime import date, timedelta
+
+# --- Migrasi Skema Database ---
+# Versi skema disimpan di PRAGMA user_version. Setiap migrasi hanya dijalankan
+# sekali: MIGRATIONS[i] membawa database dari versi i ke versi i + 1.
+#
+# DDL dan SQL pengisian setiap migrasi ditulis di sini apa adanya, bukan
+# memanggil kode aplikasi (ringkasan.py, laporan.py, akun.py, ...). Kode
+# aplikasi mengikuti skema terbaru, sedangkan migrasi lama harus tetap
+# menghasilkan skema versinya sendiri; perubahan berikutnya masuk sebagai
+# migrasi baru.
+
+STATUS_DITERIMA = "Pengajuan izin telah diterima"
+
+KOLOM_IZIN = ["id", "nama", "divisi", "jenis_pengajuan", "tanggal_pengajuan",
+              "tanggal_izin", "jumlah_hari", "file_persetujuan", "status"]
+
+SKEMA_IZIN = '''CREATE TABLE IF NOT EXISTS {nama} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nama TEXT,
+                    divisi TEXT,
+                    jenis_pengajuan TEXT,
+                    tanggal_pengajuan TEXT,
+                    tanggal_izin TEXT,
+                    jumlah_hari INTEGER,
+                    file_persetujuan BLOB,
+                    status TEXT DEFAULT 'Pending'
+                )'''
+
+
+def _m001_skema_awal(c):
+    c.execute(SKEMA_IZIN.format(nama="izin"))
+    c.execute('''CREATE TABLE IF NOT EXISTS absensi (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nama TEXT,
+                    divisi TEXT,
+                    tanggal TEXT,
+                    jam_masuk TEXT,
+                    jam_keluar TEXT,
+                    status TEXT
+                )''')
+    c.execute('''CREATE TABLE IF NOT EXISTS karyawan (
+                    ID INTEGER PRIMARY KEY,
+                    Nama TEXT,
+                    Divisi TEXT
+                )''')
+    # Tabel izin versi lama bisa punya kolom tambahan; susun ulang hanya jika
+    # strukturnya memang berbeda, bukan setiap kali aplikasi dijalankan.
+    kolom = [r[1] for r in c.execute("PRAGMA table_info(izin)")]
+    if kolom != KOLOM_IZIN:
+        c.execute("DROP TABLE IF EXISTS izin_new")
+        c.execute(SKEMA_IZIN.format(nama="izin_new"))
+        daftar = ", ".join(KOLOM_IZIN)
+        c.execute(f"INSERT INTO izin_new ({daftar}) SELECT {daftar} FROM izin")
+        c.execute("DROP TABLE izin")
+        c.execute("ALTER TABLE izin_new RENAME TO izin")
+
+
+def _m002_indeks_dan_tanggal_selesai(c):
+    # Tanggal disimpan sebagai teks ISO (YYYY-MM-DD) sehingga urutan teks sama
+    # dengan urutan tanggal dan indeks bisa dipakai untuk query rentang.
+    c.execute("ALTER TABLE izin ADD COLUMN tanggal_selesai TEXT")
+    c.execute("UPDATE izin SET tanggal_selesai = date(tanggal_izin, '+' || (jumlah_hari - 1) || ' days')")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_absensi_tanggal ON absensi(tanggal)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_absensi_nama_tanggal ON absensi(nama, tanggal)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_izin_status_jenis ON izin(status, jenis_pengajuan)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_izin_status_periode ON izin(status, tanggal_izin, tanggal_selesai)")
+
+
+def tipe_file(data):
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    return "application/octet-stream"
+
+
+def _m003_lampiran(c):
+    # File persetujuan dipindah ke tabel lampiran (content-addressed, SHA-256),
+    # izin hanya menyimpan referensinya.
+    c.execute('''CREATE TABLE IF NOT EXISTS lampiran (
+                    sha256 TEXT PRIMARY KEY,
+                    tipe TEXT,
+                    ukuran INTEGER,
+                    data BLOB NOT NULL
+                )''')
+    c.execute("ALTER TABLE izin ADD COLUMN lampiran_sha256 TEXT REFERENCES lampiran(sha256)")
+    # Ambil id dulu lalu BLOB satu per satu agar memori tidak ikut membesar.
+    ids = [r[0] for r in c.execute("SELECT id FROM izin WHERE file_persetujuan IS NOT NULL")]
+    for izin_id in ids:
+        data = c.execute("SELECT file_persetujuan FROM izin WHERE id = ?", (izin_id,)).fetchone()[0]
+        data = bytes(data)
+        sha = hashlib.sha256(data).hexdigest()
+        c.execute("INSERT OR IGNORE INTO lampiran (sha256, tipe, ukuran, data) VALUES (?, ?, ?, ?)",
+                  (sha, tipe_file(data), len(data), data))
+        c.execute("UPDATE izin SET lampiran_sha256 = ?, file_persetujuan = NULL WHERE id = ?", (sha, izin_id))
+
+
+def _m004_thumbnail_lampiran(c):
+    # Thumbnail dibuat sekali saat upload (atau saat pertama kali ditampilkan
+    # untuk lampiran lama) dan disimpan agar halaman tidak memuat file penuh.
+    c.execute("ALTER TABLE lampiran ADD COLUMN thumbnail BLOB")
+
+
+def _m005_kunci_unik_absensi(c):
+    # Satu baris absensi per (nama, tanggal). Duplikat lama dibuang, baris
+    # terbaru yang dipertahankan.
+    c.execute("DELETE FROM absensi WHERE id NOT IN (SELECT MAX(id) FROM absensi GROUP BY nama, tanggal)")
+    c.execute("DROP INDEX IF EXISTS idx_absensi_nama_tanggal")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_absensi_nama_tanggal ON absensi(nama, tanggal)")
+
+
+M006_HITUNG_ULANG = '''
+    WITH RECURSIVE hari_izin(tanggal, selesai) AS (
+        SELECT date(tanggal_izin), tanggal_selesai FROM izin
+        WHERE status = :diterima AND tanggal_selesai >= tanggal_izin
+        UNION ALL
+        SELECT date(tanggal, '+1 day'), selesai FROM hari_izin WHERE tanggal < selesai
+    ),
+    per_sumber AS (
+        SELECT tanggal, COUNT(*) AS hadir, SUM(COALESCE(lower(status), '') = 'telat') AS telat, 0 AS tidak_hadir
+        FROM absensi GROUP BY tanggal
+        UNION ALL
+        SELECT tanggal, 0, 0, COUNT(*) FROM hari_izin GROUP BY tanggal
+    )
+    SELECT tanggal, SUM(hadir) AS hadir, SUM(telat) AS telat, SUM(tidak_hadir) AS tidak_hadir
+    FROM per_sumber WHERE tanggal IS NOT NULL GROUP BY tanggal
+'''
+
+
+def _m006_daily_summary(c):
+    # Ringkasan harian untuk kalender (lihat ringkasan.py).
+    c.execute('''CREATE TABLE IF NOT EXISTS daily_summary (
+                    tanggal TEXT PRIMARY KEY,
+                    hadir INTEGER NOT NULL DEFAULT 0,
+                    telat INTEGER NOT NULL DEFAULT 0,
+                    tidak_hadir INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID''')
+    c.execute("DELETE FROM daily_summary")
+    c.execute(f"INSERT INTO daily_summary (tanggal, hadir, telat, tidak_hadir) {M006_HITUNG_ULANG}",
+              {"diterima": STATUS_DITERIMA})
+
+
+def _m007_versi_data(c):
+    # Penghitung versi per tabel, dinaikkan oleh setiap penulisan, untuk
+    # menandai cache di memori yang sudah basi.
+    c.execute('''CREATE TABLE IF NOT EXISTS versi_data (
+                    tabel TEXT PRIMARY KEY,
+                    versi INTEGER NOT NULL DEFAULT 0
+                )''')
+    c.executemany("INSERT OR IGNORE INTO versi_data (tabel) VALUES (?)",
+                  [("izin",), ("absensi",), ("karyawan",)])
+
+
+M008_REKAP = '''
+    WITH per_sumber AS (
+        SELECT nama, divisi,
+               lower(status) IN ('tepat waktu', 'telat') AS hadir,
+               lower(status) = 'telat' AS telat,
+               CASE WHEN lower(status) IN ('tepat waktu', 'telat') AND jam_masuk GLOB '[0-9][0-9]:[0-9][0-9]*'
+                    THEN CAST(substr(jam_masuk, 1, 2) AS INTEGER) * 60 + CAST(substr(jam_masuk, 4, 2) AS INTEGER)
+               END AS menit_datang,
+               NULL AS jenis_pengajuan, 0 AS hari
+        FROM absensi
+        WHERE tanggal >= :awal AND tanggal <= :akhir
+        UNION ALL
+        SELECT nama, divisi, 0, 0, NULL, jenis_pengajuan,
+               CAST(julianday(min(tanggal_selesai, :akhir)) - julianday(max(tanggal_izin, :awal)) + 1 AS INTEGER)
+        FROM izin
+        WHERE status = :diterima AND tanggal_izin <= :akhir AND tanggal_selesai >= :awal
+    )
+    INSERT INTO rekap_bulanan (bulan, nama, divisi, hari_hadir, hari_telat, rata_menit_datang,
+                               cuti, sakit, wfh, izin_telat, izin_lain)
+    SELECT :bulan, nama, MAX(divisi), COALESCE(SUM(hadir), 0), COALESCE(SUM(telat), 0), AVG(menit_datang),
+           SUM(CASE WHEN jenis_pengajuan = 'Cuti' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'Sakit' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'WFH' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'Telat' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan NOT IN ('Cuti', 'Sakit', 'WFH', 'Telat') THEN hari ELSE 0 END)
+    FROM per_sumber WHERE nama IS NOT NULL GROUP BY nama
+'''
+
+
+def _m008_bulan(c):
+    # Semua "YYYY-MM" yang punya absensi atau dicakup izin diterima.
+    bulan = {r[0] for r in c.execute("SELECT DISTINCT substr(tanggal, 1, 7) FROM absensi WHERE tanggal IS NOT NULL")}
+    for mulai, selesai in c.execute("SELECT DISTINCT tanggal_izin, tanggal_selesai FROM izin "
+                                    "WHERE status = ? AND tanggal_selesai >= tanggal_izin", (STATUS_DITERIMA,)):
+        tahun, bln = int(mulai[:4]), int(mulai[5:7])
+        while f"{tahun}-{bln:02d}" <= selesai[:7]:
+            bulan.add(f"{tahun}-{bln:02d}")
+            tahun, bln = (tahun + 1, 1) if bln == 12 else (tahun, bln + 1)
+    return sorted(b for b in bulan if len(b) == 7)
+
+
+def _m008_rekap_bulanan(c):
+    # Rekap per (bulan, nama) untuk Laporan Bulanan (lihat laporan.py).
+    c.execute('''CREATE TABLE IF NOT EXISTS rekap_bulanan (
+                    bulan TEXT NOT NULL,
+                    nama TEXT NOT NULL,
+                    divisi TEXT,
+                    hari_hadir INTEGER NOT NULL DEFAULT 0,
+                    hari_telat INTEGER NOT NULL DEFAULT 0,
+                    rata_menit_datang REAL,
+                    cuti INTEGER NOT NULL DEFAULT 0,
+                    sakit INTEGER NOT NULL DEFAULT 0,
+                    wfh INTEGER NOT NULL DEFAULT 0,
+                    izin_telat INTEGER NOT NULL DEFAULT 0,
+                    izin_lain INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (bulan, nama)
+                ) WITHOUT ROWID''')
+    c.execute("DELETE FROM rekap_bulanan")
+    for bulan in _m008_bulan(c):
+        tahun, bln = int(bulan[:4]), int(bulan[5:7])
+        akhir = date(tahun + bln // 12, bln % 12 + 1, 1) - timedelta(days=1)
+        c.execute(M008_REKAP, {"bulan": bulan, "awal": f"{bulan}-01", "akhir": akhir.isoformat(),
+                               "diterima": STATUS_DITERIMA})
+
+
+def _m009_jobs(c):
+    # Antrean job latar belakang (lihat jobs.py). data menyimpan file upload
+    # sampai job selesai, agar job bisa dilanjutkan setelah restart.
+    c.execute('''CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    jenis TEXT NOT NULL,
+                    parameter TEXT NOT NULL DEFAULT '{}',
+                    data BLOB,
+                    status TEXT NOT NULL DEFAULT 'Antri',
+                    progres INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER,
+                    pesan TEXT,
+                    dibuat TEXT NOT NULL DEFAULT (datetime('now')),
+                    diperbarui TEXT NOT NULL DEFAULT (datetime('now'))
+                )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+
+
+def _m010_hash(password):
+    # Format hash akun.py pada versi ini (scrypt n=2^14, r=8, p=1). Hash
+    # dengan parameter lain diperbarui otomatis saat login (akun.perlu_rehash).
+    n, r, p = 2 ** 14, 8, 1
+    salt = secrets.token_bytes(16)
+    hasil = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                           maxmem=256 * n * r + 1024 * 1024, dklen=32)
+    return f"scrypt${n}${r}${p}${base64.b64encode(salt).decode('ascii')}${base64.b64encode(hasil).decode('ascii')}"
+
+
+def _m010_users(c):
+    # Akun login di database menggantikan dict users di absen.py. Dua akun lama
+    # dipertahankan (password sama, kini di-hash); segera ganti dengan
+    # "python akun.py passwd <username>".
+    c.execute('''CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY COLLATE NOCASE,
+                    password_hash TEXT NOT NULL,
+                    role TEXT NOT NULL CHECK (role IN ('Admin', 'Karyawan')),
+                    karyawan_id INTEGER REFERENCES karyawan(ID),
+                    aktif INTEGER NOT NULL DEFAULT 1,
+                    dibuat TEXT NOT NULL DEFAULT (datetime('now'))
+                )''')
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_users_karyawan ON users(karyawan_id) WHERE karyawan_id IS NOT NULL")
+    c.executemany("INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                  [("admin", _m010_hash("admin123"), "Admin"),
+                   ("karyawan1", _m010_hash("karyawan123"), "Karyawan")])
+    c.execute("INSERT OR IGNORE INTO versi_data (tabel) VALUES ('users')")
+
+
+def _m011_normal(nama):
+    # Normalisasi nama sama dengan cocok_nama.normal pada versi ini.
+    return " ".join(str(nama or "").lower().split())
+
+
+def _m011_karyawan_id(c):
+    # Kunci integer ke karyawan.ID untuk join dan filter. INTEGER di SQLite
+    # disimpan 1-8 byte sesuai nilainya, jadi ID kecil tetap ringkas. Hanya
+    # nama yang sama persis yang diisi di sini; sisanya lewat cocok_nama.py.
+    c.execute("ALTER TABLE absensi ADD COLUMN karyawan_id INTEGER REFERENCES karyawan(ID)")
+    c.execute("ALTER TABLE izin ADD COLUMN karyawan_id INTEGER REFERENCES karyawan(ID)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_absensi_karyawan_tanggal ON absensi(karyawan_id, tanggal)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_izin_karyawan ON izin(karyawan_id)")
+    ids = {}
+    for kid, nama in c.execute("SELECT ID, Nama FROM karyawan WHERE Nama IS NOT NULL"):
+        ids.setdefault(_m011_normal(nama), []).append(kid)
+    for tabel in ("absensi", "izin"):
+        nama_tabel = [r[0] for r in c.execute(f"SELECT DISTINCT nama FROM {tabel} WHERE nama IS NOT NULL")]
+        c.executemany(f"UPDATE {tabel} SET karyawan_id = ? WHERE nama = ? AND karyawan_id IS NULL",
+                      [(ids[_m011_normal(n)][0], n) for n in nama_tabel if len(ids.get(_m011_normal(n), [])) == 1])
+
+
+def _m012_impor_staging(c):
+    # Tampungan impor "ganti bulan" per job (lihat repository.simpan_staging).
+    c.execute('''CREATE TABLE IF NOT EXISTS impor_staging (
+                    id INTEGER PRIMARY KEY,
+                    job_id INTEGER NOT NULL,
+                    nama TEXT,
+                    divisi TEXT,
+                    tanggal TEXT,
+                    jam_masuk TEXT,
+                    jam_keluar TEXT,
+                    status TEXT,
+                    karyawan_id INTEGER
+                )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_impor_staging_job ON impor_staging(job_id, id)")
+
+
+def _m013_pemilik_job(c):
+    # Worker yang sedang mengerjakan job (lihat jobs._klaim).
+    c.execute("ALTER TABLE jobs ADD COLUMN pemilik TEXT")
+
+
+def _m014_generasi_user(c):
+    # Dinaikkan setiap password diganti atau akun dinonaktifkan; sesi yang dibuat
+    # untuk generasi lama ditolak oleh proses mana pun (lihat absen.py).
+    c.execute("ALTER TABLE users ADD COLUMN generasi INTEGER NOT NULL DEFAULT 0")
+
+
+M015_REKAP = '''
+    WITH per_sumber AS (
+        SELECT karyawan_id, nama, divisi,
+               lower(status) IN ('tepat waktu', 'telat') AS hadir,
+               lower(status) = 'telat' AS telat,
+               CASE WHEN lower(status) IN ('tepat waktu', 'telat') AND jam_masuk GLOB '[0-9][0-9]:[0-9][0-9]*'
+                    THEN CAST(substr(jam_masuk, 1, 2) AS INTEGER) * 60 + CAST(substr(jam_masuk, 4, 2) AS INTEGER)
+               END AS menit_datang,
+               NULL AS jenis_pengajuan, 0 AS hari
+        FROM absensi
+        WHERE tanggal >= :awal AND tanggal <= :akhir
+        UNION ALL
+        SELECT karyawan_id, nama, divisi, 0, 0, NULL, jenis_pengajuan,
+               CAST(julianday(min(tanggal_selesai, :akhir)) - julianday(max(tanggal_izin, :awal)) + 1 AS INTEGER)
+        FROM izin
+        WHERE status = :diterima AND tanggal_izin <= :akhir AND tanggal_selesai >= :awal
+    )
+    INSERT INTO rekap_bulanan (bulan, karyawan_id, nama, divisi, hari_hadir, hari_telat, rata_menit_datang,
+                               cuti, sakit, wfh, izin_telat, izin_lain)
+    SELECT :bulan, s.karyawan_id, COALESCE(MAX(k.Nama), MAX(s.nama), CAST(s.karyawan_id AS TEXT)), MAX(s.divisi),
+           COALESCE(SUM(hadir), 0), COALESCE(SUM(telat), 0), AVG(menit_datang),
+           SUM(CASE WHEN jenis_pengajuan = 'Cuti' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'Sakit' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'WFH' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan = 'Telat' THEN hari ELSE 0 END),
+           SUM(CASE WHEN jenis_pengajuan NOT IN ('Cuti', 'Sakit', 'WFH', 'Telat') THEN hari ELSE 0 END)
+    FROM per_sumber s LEFT JOIN karyawan k ON k.ID = s.karyawan_id
+    WHERE s.karyawan_id IS NOT NULL OR s.nama IS NOT NULL
+    GROUP BY s.karyawan_id, CASE WHEN s.karyawan_id IS NULL THEN s.nama END
+'''
+
+
+def _m015_kunci_karyawan_id(c):
+    # Satu baris absensi per (karyawan_id, tanggal) untuk baris yang punya id,
+    # berapa pun ejaan namanya; duplikat lama dibuang, baris terbaru yang
+    # dipertahankan. rekap_bulanan dikunci per karyawan_id (nama hanya untuk
+    # baris tanpa id) lalu dihitung ulang bersama daily_summary.
+    c.execute("DELETE FROM absensi WHERE karyawan_id IS NOT NULL AND id NOT IN "
+              "(SELECT MAX(id) FROM absensi WHERE karyawan_id IS NOT NULL GROUP BY karyawan_id, tanggal)")
+    c.execute("DROP INDEX IF EXISTS idx_absensi_karyawan_tanggal")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_absensi_karyawan_tanggal ON absensi(karyawan_id, tanggal) "
+              "WHERE karyawan_id IS NOT NULL")
+    c.execute("DROP TABLE IF EXISTS rekap_bulanan")
+    c.execute('''CREATE TABLE rekap_bulanan (
+                    bulan TEXT NOT NULL,
+                    karyawan_id INTEGER REFERENCES karyawan(ID),
+                    nama TEXT NOT NULL,
+                    divisi TEXT,
+                    hari_hadir INTEGER NOT NULL DEFAULT 0,
+                    hari_telat INTEGER NOT NULL DEFAULT 0,
+                    rata_menit_datang REAL,
+                    cuti INTEGER NOT NULL DEFAULT 0,
+                    sakit INTEGER NOT NULL DEFAULT 0,
+                    wfh INTEGER NOT NULL DEFAULT 0,
+                    izin_telat INTEGER NOT NULL DEFAULT 0,
+                    izin_lain INTEGER NOT NULL DEFAULT 0
+                )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rekap_bulanan_bulan ON rekap_bulanan(bulan)")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_rekap_bulanan_karyawan ON rekap_bulanan(bulan, karyawan_id) "
+              "WHERE karyawan_id IS NOT NULL")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_rekap_bulanan_nama ON rekap_bulanan(bulan, nama) "
+              "WHERE karyawan_id IS NULL")
+    for bulan in _m008_bulan(c):
+        tahun, bln = int(bulan[:4]), int(bulan[5:7])
+        akhir = date(tahun + bln // 12, bln % 12 + 1, 1) - timedelta(days=1)
+        c.execute(M015_REKAP, {"bulan": bulan, "awal": f"{bulan}-01", "akhir": akhir.isoformat(),
+                               "diterima": STATUS_DITERIMA})
+    c.execute("DELETE FROM daily_summary")
+    c.execute(f"INSERT INTO daily_summary (tanggal, hadir, telat, tidak_hadir) {M006_HITUNG_ULANG}",
+              {"diterima": STATUS_DITERIMA})
+
+
+def _m016_nama_tanpa_id(c):
+    # Kunci (nama, tanggal) hanya untuk baris tanpa karyawan_id: dua karyawan
+    # bernama sama pada tanggal yang sama adalah dua baris.
+    c.execute("DROP INDEX IF EXISTS ux_absensi_nama_tanggal")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_absensi_nama_tanggal ON absensi(nama, tanggal) "
+              "WHERE karyawan_id IS NULL")
+
+
+MIGRATIONS = [
+    _m001_skema_awal,
+    _m002_indeks_dan_tanggal_selesai,
+    _m003_lampiran,
+    _m004_thumbnail_lampiran,
+    _m005_kunci_unik_absensi,
+    _m006_daily_summary,
+    _m007_versi_data,
+    _m008_rekap_bulanan,
+    _m009_jobs,
+    _m010_users,
+    _m011_karyawan_id,
+    _m012_impor_staging,
+    _m013_pemilik_job,
+    _m014_generasi_user,
+    _m015_kunci_karyawan_id,
+    _m016_nama_tanpa_id,
+]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    # Jalur cepat tanpa write lock: skema sudah terbaru.
+    if schema_version(conn) >= len(MIGRATIONS):
+        return
+    # BEGIN IMMEDIATE mengambil write lock lebih dulu, sehingga sesi lain yang
+    # memulai migrasi bersamaan menunggu lalu melihat versi yang sudah naik.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        versi = schema_version(conn)
+        for nomor in range(versi, len(MIGRATIONS)):
+            MIGRATIONS[nomor](conn)
+            conn.execute(f"PRAGMA user_version = {nomor + 1}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
@@ -0,0 +1,183 @@
+import functools
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Pengolahan Data Presensi ---
+# Semua langkah dikerjakan per kolom (vectorized), tanpa .apply atau iterrows
+# per baris, sehingga upload ribuan karyawan tetap cepat.
+
+# Batas jam datang; lewat dari ini dianggap Telat.
+BATAS_TELAT = os.environ.get("BATAS_TELAT", "09:17")
+
+KOLOM_WAJIB = ['ID', 'Nama', 'Jenis']
+KOLOM_HASIL = ['id', 'Nama', 'divisi', 'tanggal', 'status', 'datang', 'pulang', 'karyawan_id']
+
+# Jumlah baris sheet yang dibaca per potongan pada mode streaming.
+UKURAN_CHUNK = 5000
+
+
+def batas_detik(batas=BATAS_TELAT):
+    jam, menit = batas.strip().split(":")
+    return int(jam) * 3600 + int(menit) * 60
+
+
+def waktu_ke_detik(waktu):
+    # Detik sejak tengah malam; NaN jika tidak bisa dibaca. Menerima teks
+    # "HH:MM"/"HH:MM:SS", datetime.time, datetime dan Timestamp.
+    if pd.api.types.is_datetime64_any_dtype(waktu):
+        jam = waktu
+    else:
+        teks = waktu.astype("string").str.strip()
+        jam = pd.to_datetime(teks, format="%H:%M", errors="coerce")
+        for fmt in ("%H:%M:%S", "ISO8601"):
+            kosong = jam.isna() & teks.notna()
+            if not kosong.any():
+                break
+            jam = jam.fillna(pd.to_datetime(teks.where(kosong), format=fmt, errors="coerce"))
+    return (jam.dt.hour * 3600 + jam.dt.minute * 60 + jam.dt.second).astype("float64")
+
+
+@functools.lru_cache(maxsize=1)
+def _label_jam():
+    # Label "HH:MM" / "HH:MM:SS" untuk setiap detik dalam sehari, dibuat sekali.
+    return np.array([f"{d // 3600:02d}:{d % 3600 // 60:02d}" + (f":{d % 60:02d}" if d % 60 else "")
+                     for d in range(24 * 3600)], dtype=object)
+
+
+def format_jam(waktu, detik):
+    # Jam yang terbaca disimpan seragam sebagai "HH:MM" (atau "HH:MM:SS"),
+    # sisanya disimpan apa adanya.
+    hasil = pd.Series(_label_jam()[detik.fillna(0).to_numpy(dtype="int64")], index=waktu.index)
+    tidak_terbaca = detik.isna() & waktu.notna()
+    if tidak_terbaca.any():
+        hasil[tidak_terbaca] = waktu[tidak_terbaca].astype(str).str.strip()
+    hasil[waktu.isna()] = None
+    return hasil
+
+
+def hitung_status(datang, detik, batas=BATAS_TELAT):
+    return pd.Series(np.select(
+        [datang.isna(), detik.isna(), detik > batas_detik(batas)],
+        ["No Data", "Invalid Time", "Telat"],
+        default="Tepat Waktu",
+    ), index=datang.index)
+
+
+def kolom_hari(columns):
+    # ValueError jika struktur file tidak sesuai.
+    for col in KOLOM_WAJIB:
+        if col not in columns:
+            raise ValueError(f"Kolom '{col}' tidak ditemukan dalam data!")
+    day_cols = [col for col in columns if str(col).isdigit()]
+    if not day_cols:
+        raise ValueError("Tidak ditemukan kolom tanggal (1-31) dalam data!")
+    return day_cols
+
+
+def format_presensi_data(df, mapping, batas=BATAS_TELAT):
+    # df: sheet mentah (baris per ID/Jenis, kolom hari 1-31); mapping: ID -> Divisi.
+    # ID yang terdaftar di mapping (tabel karyawan) juga menjadi karyawan_id.
+    day_cols = kolom_hari(df.columns)
+
+    df = df[KOLOM_WAJIB + day_cols].assign(Jenis=df["Jenis"].str.lower())
+    df = df[df["Jenis"].isin(["datang", "pulang"])]
+    df_long = df.melt(id_vars=KOLOM_WAJIB, value_vars=day_cols, var_name='tanggal', value_name='waktu')
+    df_long = df_long.dropna(subset=['waktu'])
+    # Sama dengan pivot_table(aggfunc='first'): nilai pertama per ID/Nama/tanggal/Jenis.
+    df_long = df_long.drop_duplicates(['ID', 'Nama', 'tanggal', 'Jenis'])
+    df_wide = df_long.set_index(['ID', 'Nama', 'tanggal', 'Jenis'])['waktu'].unstack('Jenis')
+    df_wide = df_wide.reindex(columns=['datang', 'pulang']).reset_index()
+    df_wide.columns.name = None
+
+    detik_datang = waktu_ke_detik(df_wide['datang'])
+    detik_pulang = waktu_ke_detik(df_wide['pulang'])
+    return pd.DataFrame({
+        'id': df_wide['ID'],
+        'Nama': df_wide['Nama'],
+        'divisi': df_wide['ID'].map(mapping).fillna("No Data"),
+        'tanggal': df_wide['tanggal'],
+        'status': hitung_status(df_wide['datang'], detik_datang, batas),
+        'datang': format_jam(df_wide['datang'], detik_datang),
+        'pulang': format_jam(df_wide['pulang'], detik_pulang),
+        'karyawan_id': df_wide['ID'].where(df_wide['ID'].isin(list(mapping))),
+    })[KOLOM_HASIL]
+
+
+def ke_baris_absensi(df_proc, tahun, bulan):
+    # Hasil format_presensi_data -> tuple siap insert ke tabel absensi.
+    tanggal = df_proc['tanggal'].astype(int).map({d: f"{tahun}-{bulan:02d}-{d:02d}" for d in range(1, 32)})
+    karyawan_id = df_proc['karyawan_id'].astype('Int64').astype(object).where(df_proc['karyawan_id'].notna(), None)
+    kolom = [df_proc['Nama'], df_proc['divisi'], tanggal, df_proc['datang'], df_proc['pulang'], df_proc['status'],
+             karyawan_id]
+    return list(zip(*(k.tolist() for k in kolom)))
+
+
+# --- Impor Streaming ---
+# File dibaca per potongan baris sehingga memori puncak tergantung UKURAN_CHUNK,
+# bukan ukuran file. Setiap potongan diolah dengan format_presensi_data yang
+# sama, jadi hasilnya identik dengan impor biasa. Syaratnya baris datang/pulang
+# milik satu ID berurutan, seperti pada ekspor mesin absensi. File yang tidak
+# memenuhinya (mis. semua baris Datang lalu semua baris Pulang) ditolak dengan
+# ValueError, karena satu hari karyawan akan terpecah menjadi dua baris;
+# file seperti itu diimpor tanpa mode streaming.
+
+def chunk_xlsx(file, ukuran=UKURAN_CHUNK):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        while True:
+            buf = list(itertools.islice(rows, ukuran))
+            if not buf:
+                return
+            yield pd.DataFrame(buf, columns=list(header))
+    finally:
+        wb.close()
+
+
+def chunk_csv(file, ukuran=UKURAN_CHUNK):
+    yield from pd.read_csv(file, chunksize=ukuran)
+
+
+def _cek_id_baru(potongan, selesai):
+    ids = set(potongan['ID'].dropna().unique())
+    ulang = ids & selesai
+    if ulang:
+        raise ValueError(f"Baris ID {sorted(ulang)[0]} tidak berurutan dalam file. "
+                         "Urutkan file per ID atau impor tanpa mode streaming.")
+    selesai |= ids
+    return potongan
+
+
+def per_grup_id(chunks):
+    # Potong ulang agar semua baris satu ID selalu berada di potongan yang sama.
+    # ID yang muncul lagi setelah potongannya diolah berarti file tidak urut per ID.
+    sisa = None
+    selesai = set()
+    for chunk in chunks:
+        kolom_hari(chunk.columns)
+        if sisa is not None:
+            chunk = pd.concat([sisa, chunk], ignore_index=True)
+        if chunk.empty:
+            continue
+        # Baris ID terakhir ditahan: lanjutannya bisa ada di potongan berikutnya.
+        ditahan = (chunk['ID'] == chunk['ID'].iloc[-1]).to_numpy()
+        if not ditahan.all():
+            yield _cek_id_baru(chunk[~ditahan], selesai)
+        sisa = chunk[ditahan]
+    if sisa is not None and not sisa.empty:
+        yield _cek_id_baru(sisa, selesai)
+
+
+def stream_presensi(chunks, mapping, tahun, bulan, batas=BATAS_TELAT):
+    # Generator tuple absensi (lihat ke_baris_absensi) dari potongan sheet mentah.
+    for chunk in per_grup_id(chunks):
+        df_proc = format_presensi_data(chunk, mapping, batas)
+        yield from ke_baris_absensi(df_proc, tahun, bulan)
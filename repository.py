@@ -0,0 +1,539 @@
+import functools
+import hashlib
+import io
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+import akun
+import cache
+import instrumen
+import laporan
+import migrations
+import ringkasan
+from indeks_izin import IndeksIzin, KOLOM as KOLOM_INDEKS_IZIN
+
+# --- Koneksi Database ---
+# Satu pool koneksi per proses. Koneksi dipakai ulang antar-rerun sehingga
+# statement cache sqlite3 tetap hangat dan PRAGMA cukup diset sekali.
+
+DB_PATH = os.environ.get("ABSENSI_DB", "absensi.db")
+BUSY_TIMEOUT_MS = 5000
+POOL_SIZE = 8
+
+STATUS_DITERIMA = ringkasan.STATUS_DITERIMA
+STATUS_DITOLAK = "Pengajuan izin ditolak"
+THUMBNAIL_SIZE = (160, 160)
+
+
+def _buka_koneksi(path):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000,
+                           check_same_thread=False, cached_statements=256)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = _buka_koneksi(self.path)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._idle.qsize() < self.size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools = {}
+
+
+def get_pool(path=None):
+    path = path or DB_PATH
+    if path not in _pools:
+        _pools[path] = ConnectionPool(path)
+    return _pools[path]
+
+
+@contextmanager
+def koneksi():
+    # Saat instrumentasi merekam rerun ini, query dicatat (lihat instrumen.py).
+    with get_pool().connection() as conn:
+        yield instrumen.bungkus(conn)
+
+
+@contextmanager
+def transaksi():
+    # BEGIN IMMEDIATE: ambil write lock di awal agar tidak gagal di tengah jalan.
+    with koneksi() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def init_db():
+    with koneksi() as conn:
+        migrations.migrate(conn)
+
+
+def read_df(sql, params=()):
+    with koneksi() as conn, instrumen.bagian(instrumen.ringkas_sql(sql), "sql", baris=0) as entri:
+        df = pd.read_sql_query(sql, instrumen.asli(conn), params=params)
+        if entri is not None:
+            entri["baris"] = len(df)
+        return df
+
+
+# --- Versi Data ---
+
+def naikkan_versi(conn, *tabel):
+    # Dipanggil di dalam transaksi penulisan, sehingga versi ikut ter-commit.
+    conn.executemany("UPDATE versi_data SET versi = versi + 1 WHERE tabel = ?", [(t,) for t in tabel])
+
+
+def versi_data():
+    with koneksi() as conn:
+        return dict(conn.execute("SELECT tabel, versi FROM versi_data").fetchall())
+
+
+# Hasil baca di-cache per versi tabel yang dibacanya (lihat cache.py).
+cached = functools.partial(cache.cached, versi_fn=versi_data)
+
+
+# --- Tabel karyawan ---
+
+@cached("karyawan")
+def load_karyawan():
+    return read_df("SELECT ID, Nama, Divisi FROM karyawan")
+
+
+def karyawan_tanpa_akun():
+    with koneksi() as conn:
+        return [r[0] for r in conn.execute("SELECT k.ID FROM karyawan k LEFT JOIN users u ON u.karyawan_id = k.ID "
+                                           "WHERE u.username IS NULL ORDER BY k.ID")]
+
+
+# --- Tabel users ---
+
+KOLOM_USER = ["username", "role", "karyawan_id", "nama", "divisi", "generasi"]
+
+
+@cached("users", "karyawan")
+def load_user(username):
+    # Identitas akun aktif beserta nama/divisi dari karyawan yang terhubung.
+    with koneksi() as conn:
+        row = conn.execute("SELECT u.username, u.role, u.karyawan_id, k.Nama, k.Divisi, u.generasi FROM users u "
+                           "LEFT JOIN karyawan k ON k.ID = u.karyawan_id WHERE u.username = ? AND u.aktif = 1",
+                           (username,)).fetchone()
+    return dict(zip(KOLOM_USER, row)) if row else None
+
+
+def verifikasi_login(username, password):
+    # Username (ejaan tersimpan) jika cocok, atau None. Hash dengan parameter
+    # lama diperbarui ke AKUN_SCRYPT_N saat ini.
+    with koneksi() as conn:
+        row = conn.execute("SELECT username, password_hash FROM users WHERE username = ? AND aktif = 1",
+                           (username.strip(),)).fetchone()
+    if row is None:
+        akun.cek_password(password, akun.hash_dummy())
+        return None
+    if not akun.cek_password(password, row[1]):
+        return None
+    if akun.perlu_rehash(row[1]):
+        with transaksi() as conn:
+            conn.execute("UPDATE users SET password_hash = ? WHERE username = ?", (akun.hash_password(password), row[0]))
+    return row[0]
+
+
+def simpan_users(rows):
+    # rows: tuple (username, password_hash, role, karyawan_id), satu transaksi.
+    with transaksi() as conn:
+        conn.executemany(akun.SQL_SIMPAN_USER, rows)
+        naikkan_versi(conn, "users")
+
+
+# Mengubah password atau status akun selalu menaikkan users.generasi, sehingga
+# sesi yang sudah ada berakhir di semua proses (lihat akun.SesiStore).
+
+def ganti_password(username, password):
+    with transaksi() as conn:
+        cur = conn.execute("UPDATE users SET password_hash = ?, generasi = generasi + 1 WHERE username = ?",
+                           (akun.hash_password(password), username))
+        naikkan_versi(conn, "users")
+    return cur.rowcount > 0
+
+
+def nonaktifkan_user(username):
+    with transaksi() as conn:
+        cur = conn.execute("UPDATE users SET aktif = 0, generasi = generasi + 1 WHERE username = ?", (username,))
+        naikkan_versi(conn, "users")
+    return cur.rowcount > 0
+
+
+# --- Tabel absensi ---
+
+# Upsert: impor ulang atau Accept dua kali tidak menambah baris, hanya
+# memperbarui baris yang sudah ada. Baris dengan karyawan_id memakai kunci
+# (karyawan_id, tanggal), jadi ejaan nama yang berbeda tetap satu baris (nama
+# yang tersimpan dipertahankan), dan dua karyawan bernama sama tetap dua
+# baris. Baris tanpa id memakai kunci (nama, tanggal) di antara baris tanpa id
+# saja (migrasi 16); baris lama tanpa id diberi id lewat cocok_nama.py.
+KOLOM_TULIS_ABSENSI = "nama, divisi, tanggal, jam_masuk, jam_keluar, status, karyawan_id"
+_SQL_SET_ABSENSI = ("divisi = excluded.divisi, jam_masuk = excluded.jam_masuk, jam_keluar = excluded.jam_keluar, "
+                    "status = excluded.status")
+_SQL_UPSERT_ABSENSI = (f"ON CONFLICT(karyawan_id, tanggal) WHERE karyawan_id IS NOT NULL DO UPDATE SET {_SQL_SET_ABSENSI} "
+                       f"ON CONFLICT(nama, tanggal) WHERE karyawan_id IS NULL DO UPDATE SET {_SQL_SET_ABSENSI}")
+SQL_INSERT_ABSENSI = (f"INSERT INTO absensi ({KOLOM_TULIS_ABSENSI}) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                      f"{_SQL_UPSERT_ABSENSI}")
+
+
+def _catat_tanggal(rows, tanggal):
+    # Teruskan rows apa adanya sambil mencatat tanggal yang tersentuh.
+    for row in rows:
+        tanggal.add(row[2])
+        yield row
+
+
+def save_absensi(rows, refresh=True):
+    # rows: iterable tuple (nama, divisi, tanggal, jam_masuk, jam_keluar, status, karyawan_id).
+    # Generator dikonsumsi langsung oleh executemany tanpa dikumpulkan dulu.
+    # refresh=False: ringkasan dan rekap diperbarui pemanggil (lihat refresh_bulan).
+    tanggal = set()
+    with transaksi() as conn:
+        jumlah = conn.executemany(SQL_INSERT_ABSENSI, _catat_tanggal(rows, tanggal)).rowcount
+        if refresh:
+            ringkasan.refresh_tanggal(conn, tanggal)
+            refresh_rekap(conn, tanggal)
+        naikkan_versi(conn, "absensi")
+    return jumlah
+
+
+# Impor "ganti bulan" (jobs.py) menampung barisnya di impor_staging per
+# batch (transaksi pendek). Data lama baru dihapus dan diganti dalam satu
+# transaksi setelah seluruh file terbaca, jadi impor yang gagal di tengah
+# jalan tidak menyentuh absensi sama sekali.
+
+def simpan_staging(job_id, rows):
+    with transaksi() as conn:
+        return conn.executemany(f"INSERT INTO impor_staging (job_id, {KOLOM_TULIS_ABSENSI}) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", ((job_id, *r) for r in rows)).rowcount
+
+
+def hapus_staging(job_id):
+    with transaksi() as conn:
+        conn.execute("DELETE FROM impor_staging WHERE job_id = ?", (job_id,))
+
+
+def ganti_absensi_bulan(job_id, tahun, bulan):
+    # Hapus bulan lalu isi dari staging job ini dalam satu transaksi. Baris
+    # "Izin" hasil persetujuan tidak berasal dari file, jadi tidak ikut dihapus
+    # (IS NOT: baris berstatus NULL tetap ikut dihapus).
+    # Staging kosong (sudah diterapkan sebelum proses terhenti): tidak ada yang diubah.
+    with transaksi() as conn:
+        if conn.execute("SELECT 1 FROM impor_staging WHERE job_id = ? LIMIT 1", (job_id,)).fetchone() is None:
+            return 0
+        conn.execute("DELETE FROM absensi WHERE tanggal >= ? AND tanggal < ? AND status IS NOT 'Izin'",
+                     rentang_bulan(tahun, bulan))
+        # Urut id: baris yang muncul belakangan di file menang, sama dengan executemany.
+        jumlah = conn.execute(f"INSERT INTO absensi ({KOLOM_TULIS_ABSENSI}) SELECT {KOLOM_TULIS_ABSENSI} "
+                              f"FROM impor_staging WHERE job_id = ? ORDER BY id {_SQL_UPSERT_ABSENSI}",
+                              (job_id,)).rowcount
+        conn.execute("DELETE FROM impor_staging WHERE job_id = ?", (job_id,))
+        _refresh_bulan(conn, tahun, bulan)
+        naikkan_versi(conn, "absensi")
+        return jumlah
+
+
+def _refresh_bulan(conn, tahun, bulan):
+    ringkasan.refresh_tanggal(conn, tanggal_bulan(tahun, bulan))
+    laporan.refresh_bulan(conn, f"{tahun}-{bulan:02d}")
+
+
+def refresh_bulan(tahun, bulan):
+    # Hitung ulang ringkasan harian dan rekap satu bulan setelah impor per
+    # batch, termasuk impor yang gagal setelah sebagian batch tersimpan.
+    with transaksi() as conn:
+        _refresh_bulan(conn, tahun, bulan)
+        naikkan_versi(conn, "absensi")
+
+
+def refresh_rekap(conn, daftar_tanggal, karyawan_id=None, nama=None):
+    # Hitung ulang rekap_bulanan untuk bulan-bulan yang tersentuh (bisa
+    # dibatasi ke satu karyawan, lihat laporan.refresh_bulan).
+    for bulan in sorted({t[:7] for t in daftar_tanggal if t}):
+        laporan.refresh_bulan(conn, bulan, karyawan_id, nama)
+
+
+def rentang_bulan(tahun, bulan):
+    # Batas [awal, akhir) bulan dalam format ISO, untuk query rentang yang memakai indeks.
+    awal = f"{tahun}-{bulan:02d}-01"
+    akhir = f"{tahun + 1}-01-01" if bulan == 12 else f"{tahun}-{bulan + 1:02d}-01"
+    return awal, akhir
+
+
+def tanggal_bulan(tahun, bulan):
+    awal, akhir = rentang_bulan(tahun, bulan)
+    return ringkasan.tanggal_periode(awal, (date.fromisoformat(akhir) - date.fromisoformat(awal)).days)
+
+
+# Status yang bukan presensi dan tidak ditampilkan di Data Absensi.
+STATUS_BUKAN_PRESENSI = ("Cuti", "Sakit", "WFH")
+KOLOM_ABSENSI = "nama, divisi, tanggal, jam_masuk, jam_keluar, status"
+
+
+def _filter_absensi(mulai, selesai, divisi=None, nama=None, status=()):
+    # Rentang tanggal inklusif [mulai, selesai]; memakai indeks absensi(tanggal).
+    sql = " WHERE tanggal >= ? AND tanggal <= ? AND (status IS NULL OR status NOT IN (?, ?, ?))"
+    params = [mulai, selesai, *STATUS_BUKAN_PRESENSI]
+    if divisi:
+        sql += " AND divisi = ?"
+        params.append(divisi)
+    if nama:
+        # % dan _ dari input dicari apa adanya, bukan sebagai wildcard.
+        sql += " AND nama LIKE ? ESCAPE '\\'"
+        params.append("%" + nama.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+    if status:
+        sql += f" AND status IN ({', '.join('?' * len(status))})"
+        params += list(status)
+    return sql, params
+
+
+@cached("absensi")
+def cari_absensi(mulai, selesai, divisi=None, nama=None, status=(), limit=100, offset=0):
+    where, params = _filter_absensi(mulai, selesai, divisi, nama, status)
+    return read_df(f"SELECT {KOLOM_ABSENSI} FROM absensi{where} ORDER BY tanggal, nama LIMIT ? OFFSET ?",
+                   params + [limit, offset])
+
+
+@cached("absensi")
+def count_absensi(mulai, selesai, divisi=None, nama=None, status=()):
+    where, params = _filter_absensi(mulai, selesai, divisi, nama, status)
+    with koneksi() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM absensi{where}", params).fetchone()[0]
+
+
+@cached("absensi")
+def divisi_absensi(mulai, selesai):
+    with koneksi() as conn:
+        return [r[0] for r in conn.execute("SELECT DISTINCT divisi FROM absensi WHERE tanggal >= ? AND tanggal <= ? "
+                                           "AND divisi IS NOT NULL ORDER BY divisi", (mulai, selesai))]
+
+
+@cached("absensi")
+def load_absensi_tanggal(tanggal):
+    return read_df("SELECT * FROM absensi WHERE tanggal = ?", (tanggal,))
+
+
+@cached("absensi", "izin")
+def load_ringkasan_bulan(tahun, bulan):
+    return read_df("SELECT tanggal, hadir, telat, tidak_hadir FROM daily_summary WHERE tanggal >= ? AND tanggal < ?",
+                   rentang_bulan(tahun, bulan))
+
+
+# --- Laporan Bulanan ---
+
+@cached("absensi", "izin")
+def load_rekap(awal, akhir, per_divisi=False, per_bulan=True):
+    # awal, akhir: "YYYY-MM" inklusif.
+    df = read_df(laporan.sql_rollup(per_divisi, per_bulan), (awal, akhir))
+    if "karyawan_id" in df:
+        # Kosong untuk nama yang belum punya id; tanpa ini pandas menjadikannya float.
+        df["karyawan_id"] = df["karyawan_id"].astype("Int64")
+    return df
+
+
+# --- Tabel lampiran ---
+
+def buat_thumbnail(data):
+    # JPEG kecil untuk ditampilkan di tabel; None jika Pillow tidak ada atau
+    # file bukan gambar.
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.thumbnail(THUMBNAIL_SIZE)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, format="JPEG", quality=70)
+    except Exception:
+        return None
+    return buf.getvalue()
+
+
+def simpan_lampiran(conn, data):
+    # Content-addressed: file yang sama hanya disimpan sekali.
+    sha = hashlib.sha256(data).hexdigest()
+    instrumen.blob("lampiran ditulis", len(data))
+    if conn.execute("SELECT 1 FROM lampiran WHERE sha256 = ?", (sha,)).fetchone() is None:
+        conn.execute("INSERT INTO lampiran (sha256, tipe, ukuran, data, thumbnail) VALUES (?, ?, ?, ?, ?)",
+                     (sha, migrations.tipe_file(data), len(data), data, buat_thumbnail(data)))
+    return sha
+
+
+def load_lampiran(sha256):
+    # (data, tipe) atau None jika tidak ada.
+    with koneksi() as conn:
+        row = conn.execute("SELECT data, tipe FROM lampiran WHERE sha256 = ?", (sha256,)).fetchone()
+    if row is None:
+        return None
+    instrumen.blob("lampiran dibaca", len(row[0]))
+    return bytes(row[0]), row[1]
+
+
+def load_thumbnail(sha256):
+    with koneksi() as conn:
+        row = conn.execute("SELECT thumbnail FROM lampiran WHERE sha256 = ?", (sha256,)).fetchone()
+    if row is None:
+        return None
+    if row[0] is not None:
+        instrumen.blob("thumbnail dibaca", len(row[0]))
+        return bytes(row[0])
+    # Lampiran lama belum punya thumbnail: buat sekali lalu simpan.
+    thumb = buat_thumbnail(load_lampiran(sha256)[0])
+    if thumb is not None:
+        with transaksi() as conn:
+            conn.execute("UPDATE lampiran SET thumbnail = ? WHERE sha256 = ?", (thumb, sha256))
+    return thumb
+
+
+# --- Tabel izin ---
+
+# Kolom izin tanpa isi file; file diambil terpisah lewat load_lampiran.
+KOLOM_IZIN = ("id, nama, divisi, jenis_pengajuan, tanggal_pengajuan, tanggal_izin, tanggal_selesai, "
+              "jumlah_hari, lampiran_sha256, status, karyawan_id")
+
+
+def hitung_tanggal_selesai(tanggal_izin, jumlah_hari):
+    start = datetime.strptime(tanggal_izin, "%Y-%m-%d").date()
+    return (start + timedelta(days=int(jumlah_hari) - 1)).strftime("%Y-%m-%d")
+
+
+def save_izin(nama, divisi, jenis_pengajuan, tanggal_pengajuan, tanggal_izin, jumlah_hari, file_persetujuan_bytes,
+              karyawan_id=None):
+    tanggal_selesai = hitung_tanggal_selesai(tanggal_izin, jumlah_hari)
+    with transaksi() as conn:
+        sha = simpan_lampiran(conn, file_persetujuan_bytes) if file_persetujuan_bytes else None
+        conn.execute('''INSERT INTO izin (nama, divisi, jenis_pengajuan, tanggal_pengajuan, tanggal_izin, tanggal_selesai, jumlah_hari, lampiran_sha256, status, karyawan_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (nama, divisi, jenis_pengajuan, tanggal_pengajuan, tanggal_izin, tanggal_selesai, jumlah_hari, sha, "Pending",
+                      karyawan_id))
+        naikkan_versi(conn, "izin")
+
+
+def _filter_izin(status, jenis_pengajuan):
+    sql, params = " WHERE 1=1", []
+    if status is not None:
+        sql += " AND status = ?"
+        params.append(status)
+    if jenis_pengajuan is not None:
+        sql += " AND jenis_pengajuan = ?"
+        params.append(jenis_pengajuan)
+    return sql, params
+
+
+@cached("izin")
+def load_izin(status=None, jenis_pengajuan=None, limit=None, offset=0):
+    where, params = _filter_izin(status, jenis_pengajuan)
+    sql = f"SELECT {KOLOM_IZIN} FROM izin{where}"
+    if limit is not None:
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    return read_df(sql, params)
+
+
+@cached("izin")
+def count_izin(status=None, jenis_pengajuan=None):
+    where, params = _filter_izin(status, jenis_pengajuan)
+    with koneksi() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM izin{where}", params).fetchone()[0]
+
+
+@cached("izin")
+def count_izin_per_jenis():
+    return read_df("SELECT jenis_pengajuan, COUNT(*) AS Jumlah FROM izin GROUP BY jenis_pengajuan")
+
+
+def baris_absensi_izin(izin_record):
+    # ValueError jika tanggal_izin tidak valid; pemanggil yang menampilkan pesan.
+    start = datetime.strptime(izin_record['tanggal_izin'], "%Y-%m-%d").date()
+    days = int(izin_record['jumlah_hari'])
+    return [(izin_record['nama'], izin_record['divisi'], (start + timedelta(days=i)).strftime("%Y-%m-%d"), "", "", "Izin",
+             izin_record.get('karyawan_id')) for i in range(days)]
+
+
+def terima_izin(izin_id):
+    # Ubah status dan isi absensi "Izin" dalam satu transaksi. Hanya izin yang
+    # masih Pending yang diproses, jadi klik Accept berulang tidak berefek.
+    with transaksi() as conn:
+        row = conn.execute("SELECT nama, divisi, tanggal_izin, jumlah_hari, karyawan_id FROM izin "
+                           "WHERE id = ? AND status = 'Pending'", (int(izin_id),)).fetchone()
+        if row is None:
+            return False
+        record = dict(zip(['nama', 'divisi', 'tanggal_izin', 'jumlah_hari', 'karyawan_id'], row))
+        conn.execute("UPDATE izin SET status = ? WHERE id = ?", (STATUS_DITERIMA, int(izin_id)))
+        naikkan_versi(conn, "izin", "absensi")
+        rows = baris_absensi_izin(record)
+        conn.executemany(SQL_INSERT_ABSENSI, rows)
+        ringkasan.refresh_tanggal(conn, [r[2] for r in rows])
+        # Rekap per id, atau per nama jika izin belum punya karyawan_id.
+        refresh_rekap(conn, [r[2] for r in rows], record['karyawan_id'],
+                      record['nama'] if record['karyawan_id'] is None else None)
+    return True
+
+
+def tolak_izin(izin_id):
+    with transaksi() as conn:
+        cur = conn.execute("UPDATE izin SET status = ? WHERE id = ? AND status = 'Pending'",
+                           (STATUS_DITOLAK, int(izin_id)))
+        naikkan_versi(conn, "izin")
+    return cur.rowcount > 0
+
+
+# --- Indeks Interval Izin ---
+# Dibangun ulang hanya jika versi tabel izin berubah.
+
+_indeks_izin = (None, None)
+
+
+def indeks_izin():
+    global _indeks_izin
+    versi = versi_data().get("izin")
+    if _indeks_izin[0] != versi or _indeks_izin[1] is None:
+        with koneksi() as conn:
+            rows = conn.execute(f"SELECT {', '.join(KOLOM_INDEKS_IZIN)} FROM izin "
+                                "WHERE status = ? AND tanggal_selesai IS NOT NULL", (STATUS_DITERIMA,)).fetchall()
+        _indeks_izin = (versi, IndeksIzin(rows))
+    return _indeks_izin[1]
+
+
+def izin_aktif_pada(tanggal):
+    return pd.DataFrame(indeks_izin().pada(tanggal), columns=KOLOM_INDEKS_IZIN)
@@ -0,0 +1,98 @@
+import argparse
+import sys
+from datetime import date, timedelta
+
+# --- Ringkasan Harian (daily_summary) ---
+# Satu baris per tanggal: hadir (jumlah baris absensi), telat, dan tidak_hadir
+# (izin diterima yang mencakup tanggal tsb). Diperbarui oleh write path di
+# repository untuk tanggal yang tersentuh saja; rebuild() menghitung ulang
+# semuanya dan cek() membandingkan isi tabel dengan hasil hitung ulang.
+#
+#   python ringkasan.py rebuild
+#   python ringkasan.py check
+
+STATUS_DITERIMA = "Pengajuan izin telah diterima"
+
+SQL_HITUNG_ULANG = '''
+    WITH RECURSIVE hari_izin(tanggal, selesai) AS (
+        SELECT date(tanggal_izin), tanggal_selesai FROM izin
+        WHERE status = :diterima AND tanggal_selesai >= tanggal_izin
+        UNION ALL
+        SELECT date(tanggal, '+1 day'), selesai FROM hari_izin WHERE tanggal < selesai
+    ),
+    per_sumber AS (
+        SELECT tanggal, COUNT(*) AS hadir, SUM(COALESCE(lower(status), '') = 'telat') AS telat, 0 AS tidak_hadir
+        FROM absensi GROUP BY tanggal
+        UNION ALL
+        SELECT tanggal, 0, 0, COUNT(*) FROM hari_izin GROUP BY tanggal
+    )
+    SELECT tanggal, SUM(hadir) AS hadir, SUM(telat) AS telat, SUM(tidak_hadir) AS tidak_hadir
+    FROM per_sumber WHERE tanggal IS NOT NULL GROUP BY tanggal
+'''
+
+SQL_REFRESH_TANGGAL = '''
+    INSERT INTO daily_summary (tanggal, hadir, telat, tidak_hadir)
+    SELECT :tanggal,
+           (SELECT COUNT(*) FROM absensi WHERE tanggal = :tanggal),
+           (SELECT COUNT(*) FROM absensi WHERE tanggal = :tanggal AND lower(status) = 'telat'),
+           (SELECT COUNT(*) FROM izin WHERE status = :diterima
+                AND tanggal_izin <= :tanggal AND tanggal_selesai >= :tanggal)
+    WHERE true
+    ON CONFLICT(tanggal) DO UPDATE SET hadir = excluded.hadir, telat = excluded.telat,
+                                       tidak_hadir = excluded.tidak_hadir
+'''
+
+
+def rebuild(conn):
+    # Dipanggil di dalam transaksi milik pemanggil.
+    conn.execute("DELETE FROM daily_summary")
+    conn.execute(f"INSERT INTO daily_summary (tanggal, hadir, telat, tidak_hadir) {SQL_HITUNG_ULANG}",
+                 {"diterima": STATUS_DITERIMA})
+
+
+def refresh_tanggal(conn, daftar_tanggal):
+    # Hitung ulang hanya tanggal yang tersentuh oleh sebuah penulisan.
+    params = [{"tanggal": t, "diterima": STATUS_DITERIMA} for t in sorted(set(daftar_tanggal)) if t]
+    conn.executemany(SQL_REFRESH_TANGGAL, params)
+    conn.execute("DELETE FROM daily_summary WHERE hadir = 0 AND telat = 0 AND tidak_hadir = 0")
+
+
+def tanggal_periode(mulai, jumlah_hari):
+    start = date.fromisoformat(mulai)
+    return [(start + timedelta(days=i)).isoformat() for i in range(int(jumlah_hari))]
+
+
+def cek(conn):
+    # Daftar (tanggal, tersimpan, seharusnya) yang tidak cocok; kosong jika konsisten.
+    tersimpan = {r[0]: tuple(r[1:]) for r in conn.execute("SELECT tanggal, hadir, telat, tidak_hadir FROM daily_summary")}
+    seharusnya = {r[0]: tuple(r[1:]) for r in conn.execute(SQL_HITUNG_ULANG, {"diterima": STATUS_DITERIMA})}
+    kosong = (0, 0, 0)
+    return [(t, tersimpan.get(t, kosong), seharusnya.get(t, kosong))
+            for t in sorted(set(tersimpan) | set(seharusnya))
+            if tersimpan.get(t, kosong) != seharusnya.get(t, kosong)]
+
+
+def main(argv=None):
+    import repository as repo
+
+    parser = argparse.ArgumentParser(prog="ringkasan.py")
+    parser.add_argument("perintah", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+
+    repo.init_db()
+    if args.perintah == "rebuild":
+        with repo.transaksi() as conn:
+            rebuild(conn)
+            jumlah = conn.execute("SELECT COUNT(*) FROM daily_summary").fetchone()[0]
+        print(f"daily_summary dibangun ulang: {jumlah} tanggal")
+        return 0
+    with repo.koneksi() as conn:
+        selisih = cek(conn)
+    for tanggal, tersimpan, seharusnya in selisih:
+        print(f"{tanggal}: tersimpan {tersimpan}, seharusnya {seharusnya}")
+    print("Konsisten." if not selisih else f"{len(selisih)} tanggal tidak konsisten.")
+    return 1 if selisih else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
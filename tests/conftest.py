@@ -0,0 +1,18 @@
+import pytest
+
+import cache
+import repository as repo
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # Database baru (skema terbaru) untuk satu test; pool dan cache proses
+    # tidak dipakai bersama antar-test.
+    path = str(tmp_path / "absensi.db")
+    monkeypatch.setattr(repo, "DB_PATH", path)
+    monkeypatch.setattr(repo, "_indeks_izin", (None, None))
+    cache.query_cache.clear()
+    repo.init_db()
+    yield path
+    repo.get_pool(path).close()
+    cache.query_cache.clear()
@@ -0,0 +1,127 @@
+import cocok_nama
+import laporan
+import repository as repo
+import ringkasan
+
+# --- Kunci karyawan_id pada Absensi dan Rekap ---
+
+
+def tambah_karyawan(*karyawan):
+    with repo.transaksi() as conn:
+        conn.executemany("INSERT INTO karyawan (ID, Nama, Divisi) VALUES (?, ?, ?)", karyawan)
+        repo.naikkan_versi(conn, "karyawan")
+
+
+def baris(nama, tanggal, status="Tepat Waktu", karyawan_id=None):
+    return (nama, "A", tanggal, "08:00", "17:00", status, karyawan_id)
+
+
+def rekap(conn):
+    return conn.execute("SELECT karyawan_id, nama, hari_hadir, hari_telat FROM rekap_bulanan "
+                        "ORDER BY karyawan_id, nama").fetchall()
+
+
+def konsisten(conn):
+    isi = rekap(conn)
+    conn.execute("BEGIN")
+    laporan.rebuild(conn)
+    seharusnya = rekap(conn)
+    conn.rollback()
+    return isi == seharusnya and ringkasan.cek(conn) == []
+
+
+def test_ejaan_berbeda_dengan_id_sama_satu_baris(db):
+    tambah_karyawan((5, "Karyawan 5", "A"))
+    repo.save_absensi([baris("KARYAWAN 5", "2024-08-01", karyawan_id=5)])
+    repo.save_absensi([baris("Karyawan  5", "2024-08-01", "Telat", karyawan_id=5)])
+
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT nama, status FROM absensi").fetchall() == [("KARYAWAN 5", "Telat")]
+        assert rekap(conn) == [(5, "Karyawan 5", 1, 1)]
+        assert konsisten(conn)
+
+
+def test_baris_tanpa_id_tetap_per_nama(db):
+    tambah_karyawan((6, "Budi", "A"))
+    repo.save_absensi([baris("Tamu", "2024-08-01"), baris("Tamu", "2024-08-01", "Telat"),
+                       baris("Budi", "2024-08-01")])
+    # Baris ber-id tidak pernah menimpa baris tanpa id, meski namanya sama.
+    repo.save_absensi([baris("Budi", "2024-08-01", karyawan_id=6)])
+
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT nama, status, karyawan_id FROM absensi ORDER BY nama, karyawan_id").fetchall() == [
+            ("Budi", "Tepat Waktu", None), ("Budi", "Tepat Waktu", 6), ("Tamu", "Telat", None)]
+        assert rekap(conn) == [(None, "Budi", 1, 0), (None, "Tamu", 1, 1), (6, "Budi", 1, 0)]
+        assert konsisten(conn)
+
+
+def test_dua_karyawan_bernama_sama_pada_tanggal_sama(db):
+    tambah_karyawan((1, "Budi", "A"), (2, "Budi", "B"))
+    repo.save_absensi([baris("Budi", "2024-08-01", karyawan_id=1),
+                       baris("Budi", "2024-08-01", "Telat", karyawan_id=2)])
+    repo.save_absensi([baris("Budi", "2024-08-01", "Telat", karyawan_id=1)])
+
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT karyawan_id, status FROM absensi ORDER BY karyawan_id").fetchall() == [
+            (1, "Telat"), (2, "Telat")]
+        assert rekap(conn) == [(1, "Budi", 1, 1), (2, "Budi", 1, 1)]
+        assert konsisten(conn)
+
+
+def test_cocok_nama_membuang_duplikat_ejaan_lain(db):
+    tambah_karyawan((7, "Sari", "A"))
+    repo.save_absensi([baris("Sari", "2024-08-01", karyawan_id=7), baris("Sari", "2024-08-02", karyawan_id=7),
+                       baris("sari ", "2024-08-02", "Telat"), baris("sari ", "2024-08-03", "Telat")])
+
+    with repo.transaksi() as conn:
+        cocok_nama.terapkan(conn, [("absensi", "sari ", 7)])
+        ringkasan.rebuild(conn)
+        laporan.rebuild(conn)
+
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT tanggal, status, karyawan_id FROM absensi ORDER BY tanggal").fetchall() == [
+            ("2024-08-01", "Tepat Waktu", 7), ("2024-08-02", "Tepat Waktu", 7), ("2024-08-03", "Telat", 7)]
+        assert rekap(conn) == [(7, "Sari", 3, 1)]
+        assert konsisten(conn)
+
+
+def test_terima_izin_memperbarui_rekap_per_id(db):
+    tambah_karyawan((8, "Dewi", "A"))
+    repo.save_absensi([baris("DEWI", "2024-08-01", karyawan_id=8)])
+    repo.save_izin("Dewi", "A", "Cuti", "2024-08-01", "2024-08-05", 2, None, karyawan_id=8)
+    with repo.koneksi() as conn:
+        izin_id = conn.execute("SELECT id FROM izin").fetchone()[0]
+
+    assert repo.terima_izin(izin_id)
+
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT karyawan_id, nama, cuti FROM rekap_bulanan").fetchall() == [(8, "Dewi", 2)]
+        assert konsisten(conn)
+
+
+def test_ganti_bulan_menghapus_baris_tanpa_status(db):
+    repo.save_absensi([baris("Eko", "2024-08-01", None), baris("Fajar", "2024-08-02", "Izin"),
+                       baris("Gita", "2024-08-03")])
+    repo.simpan_staging(1, [baris("Hana", "2024-08-01")])
+
+    assert repo.ganti_absensi_bulan(1, 2024, 8) == 1
+
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT nama, status FROM absensi ORDER BY nama").fetchall() == [
+            ("Fajar", "Izin"), ("Hana", "Tepat Waktu")]
+        assert konsisten(conn)
+
+
+def test_cari_nama_tanpa_wildcard(db):
+    repo.save_absensi([baris("Budi_S", "2024-08-01"), baris("BudiXS", "2024-08-01"),
+                       baris("Andi 100%", "2024-08-01"), baris("Andi 1000", "2024-08-01"),
+                       baris("C:\\Rina", "2024-08-01")])
+
+    def cari(nama):
+        return sorted(repo.cari_absensi("2024-08-01", "2024-08-31", nama=nama)["nama"])
+
+    assert cari("i_S") == ["Budi_S"]
+    assert cari("100%") == ["Andi 100%"]
+    assert cari("C:\\R") == ["C:\\Rina"]
+    assert cari("budi") == ["BudiXS", "Budi_S"]
+    assert repo.count_absensi("2024-08-01", "2024-08-31", nama="_") == 1
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import repository as repo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- Pencabutan Sesi Antar-Proses ---
+# Proses Streamlit memegang sesi; perubahan akun dilakukan dari proses CLI.
+
+
+def sesi_masih_berlaku(username, generasi):
+    # Pemeriksaan yang sama dengan absen.py pada setiap rerun.
+    pengguna = repo.load_user(username)
+    return pengguna is not None and pengguna["generasi"] == generasi
+
+
+def cli(db, *argv):
+    return subprocess.run([sys.executable, "akun.py", *argv], cwd=ROOT, env=dict(os.environ, ABSENSI_DB=db),
+                          capture_output=True, text=True)
+
+
+def test_nonaktif_dari_proses_lain_mengakhiri_sesi(db):
+    generasi = repo.load_user("karyawan1")["generasi"]
+    assert sesi_masih_berlaku("karyawan1", generasi)
+
+    out = cli(db, "nonaktif", "karyawan1")
+
+    assert out.returncode == 0, out.stderr
+    assert not sesi_masih_berlaku("karyawan1", generasi)
+    assert repo.verifikasi_login("karyawan1", "karyawan123") is None
+    assert sesi_masih_berlaku("admin", repo.load_user("admin")["generasi"])
+
+
+def test_ganti_password_mengakhiri_sesi_lama(db):
+    generasi = repo.load_user("admin")["generasi"]
+    assert repo.ganti_password("admin", "rahasia baru")
+    assert not sesi_masih_berlaku("admin", generasi)
+    assert repo.verifikasi_login("admin", "rahasia baru") == "admin"
+    assert sesi_masih_berlaku("admin", repo.load_user("admin")["generasi"])
+
+
+def test_nonaktif_akun_tidak_ada(db):
+    assert cli(db, "nonaktif", "tidak-ada").returncode == 1
@@ -0,0 +1,73 @@
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from indeks_izin import IndeksIzin, KOLOM
+
+# --- IndeksIzin vs Brute Force dan Query SQL ---
+
+
+def buat_izin(jumlah, seed, durasi=(1, 2, 3, 5, 10, 90, 365)):
+    rnd = random.Random(seed)
+    awal = date(2023, 1, 1)
+    rows = []
+    for i in range(1, jumlah + 1):
+        mulai = awal + timedelta(days=rnd.randint(0, 2 * 365))
+        hari = rnd.choice(durasi)
+        rows.append((i, f"KARYAWAN {i % 97}", "Divisi", "Cuti", mulai.isoformat(),
+                     (mulai + timedelta(days=hari - 1)).isoformat(), hari, i % 97 or None))
+    return rows
+
+
+def brute_force(rows, awal, akhir):
+    return sorted((r for r in rows if r[4] <= akhir and r[5] >= awal), key=lambda r: (r[4], r[0]))
+
+
+def tanggal_uji(seed, jumlah=200):
+    rnd = random.Random(seed)
+    return [(date(2022, 12, 1) + timedelta(days=rnd.randint(0, 800))).isoformat() for _ in range(jumlah)]
+
+
+@pytest.mark.parametrize("jumlah", [0, 1, 2, 50, 2000])
+def test_pada_dan_dalam_sama_dengan_brute_force(jumlah):
+    rows = buat_izin(jumlah, seed=jumlah)
+    indeks = IndeksIzin(rows)
+    assert len(indeks) == jumlah
+    for t in tanggal_uji(jumlah):
+        assert indeks.pada(t) == brute_force(rows, t, t)
+        assert indeks.jumlah_pada(t) == len(brute_force(rows, t, t))
+        akhir = (date.fromisoformat(t) + timedelta(days=random.Random(t).randint(0, 60))).isoformat()
+        assert indeks.dalam(t, akhir) == brute_force(rows, t, akhir)
+        assert indeks.jumlah_dalam(t, akhir) == len(brute_force(rows, t, akhir))
+
+
+def test_izin_sama_persis_dan_satu_hari():
+    rows = [(i, "A", "D", "Cuti", "2024-03-01", "2024-03-01", 1, 1) for i in range(1, 6)]
+    rows += [(9, "B", "D", "Cuti", "2024-01-01", "2024-12-31", 366, 2)]
+    indeks = IndeksIzin(rows)
+    assert [r[0] for r in indeks.pada("2024-03-01")] == [9, 1, 2, 3, 4, 5]
+    assert [r[0] for r in indeks.pada("2024-03-02")] == [9]
+    assert indeks.pada("2025-01-01") == []
+
+
+def test_sama_dengan_query_overlap_sql():
+    rows = buat_izin(20000, seed=42)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE izin ({', '.join(KOLOM)})")
+    conn.executemany(f"INSERT INTO izin VALUES ({', '.join('?' * len(KOLOM))})", rows)
+    indeks = IndeksIzin(rows)
+    for t in tanggal_uji(7, 100):
+        sql = conn.execute("SELECT * FROM izin WHERE tanggal_izin <= ? AND tanggal_selesai >= ? "
+                           "ORDER BY tanggal_izin, id", (t, t)).fetchall()
+        assert indeks.pada(t) == sql
+    conn.close()
+
+
+def test_jumlah_per_tanggal():
+    rows = buat_izin(300, seed=3)
+    indeks = IndeksIzin(rows)
+    per_hari = indeks.jumlah_per_tanggal("2023-06-01", "2023-06-30")
+    assert len(per_hari) == 30
+    assert all(n == len(brute_force(rows, t, t)) for t, n in per_hari.items())
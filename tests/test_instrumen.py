@@ -0,0 +1,50 @@
+import json
+import os
+
+import instrumen
+
+# --- Statistik per Menu dari Log ---
+
+
+def tulis(path, *rerun):
+    with open(path, "a", encoding="utf-8") as f:
+        for menu, ms in rerun:
+            f.write(json.dumps({"menu": menu, "total_ms": ms}) + "\n")
+
+
+def statistik_penuh(path):
+    per_menu = {}
+    for r in instrumen.baca_log(path):
+        per_menu.setdefault(r["menu"], []).append(r["total_ms"])
+    return [(m, len(v), instrumen._persentil(v, 50), instrumen._persentil(v, 95), max(v))
+            for m, v in sorted(per_menu.items())]
+
+
+def test_statistik_hanya_membaca_tambahan_log(tmp_path, monkeypatch):
+    path = str(tmp_path / "rerun.jsonl")
+    assert instrumen.statistik_menu(path) == []
+    tulis(path, *[("Dashboard", float(i)) for i in range(50)], ("Kalender", 7.0))
+    assert instrumen.statistik_menu(path) == statistik_penuh(path)
+
+    # Baris yang belum selesai ditulis menunggu pemanggilan berikutnya.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"menu": "Kalender", "total_')
+    dibaca = []
+    asli = instrumen._StatistikLog._tambah
+    monkeypatch.setattr(instrumen._StatistikLog, "_tambah", lambda self, b: (dibaca.append(b), asli(self, b)))
+    assert instrumen.statistik_menu(path) == statistik_penuh(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('ms": 9.0}\n')
+    tulis(path, ("Dashboard", 100.0))
+    assert instrumen.statistik_menu(path) == statistik_penuh(path)
+    assert len(dibaca) == 2
+
+
+def test_statistik_setelah_rotasi_log(tmp_path):
+    path = str(tmp_path / "rerun.jsonl")
+    tulis(path, ("Dashboard", 1.0), ("Dashboard", 2.0))
+    assert instrumen.statistik_menu(path) == statistik_penuh(path)
+    os.replace(path, f"{path}.1")
+    tulis(path, ("Dashboard", 3.0))
+    assert instrumen.statistik_menu(path) == statistik_penuh(path)
+    assert instrumen.statistik_menu(path)[0][1] == 3
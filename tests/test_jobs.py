@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+
+import jobs
+import laporan
+import repository as repo
+import ringkasan
+from benchmarks.bench_impor import buat_workbook
+
+# --- Impor Absensi sebagai Job ---
+
+KARYAWAN = 20
+TAHUN, BULAN = 2024, 8
+
+
+@pytest.fixture
+def karyawan(db):
+    with repo.transaksi() as conn:
+        conn.executemany("INSERT INTO karyawan (ID, Nama, Divisi) VALUES (?, ?, ?)",
+                         [(k, f"KARYAWAN {k}", f"Divisi {k % 3}") for k in range(1, KARYAWAN + 1)])
+        repo.naikkan_versi(conn, "karyawan")
+
+
+def csv_bulan(seed):
+    return buat_workbook(KARYAWAN, hari=31, seed=seed).to_csv(index=False).encode("utf-8")
+
+
+def impor(data, ganti):
+    job_id = jobs.kirim("impor_absensi", {"tahun": TAHUN, "bulan": BULAN, "nama_file": "absen.csv",
+                                          "ganti": ganti, "streaming": False}, data=data)
+    jobs.jalankan(job_id)
+    return jobs.ambil(job_id)
+
+
+def gagal_pada_panggilan(monkeypatch, nama, ke):
+    asli = getattr(repo, nama)
+    panggilan = []
+
+    def ganti(*args, **kwargs):
+        panggilan.append(1)
+        if len(panggilan) == ke:
+            raise RuntimeError("gagal disengaja")
+        return asli(*args, **kwargs)
+    monkeypatch.setattr(repo, nama, ganti)
+
+
+def isi(conn, tabel, urut):
+    return conn.execute(f"SELECT * FROM {tabel} ORDER BY {urut}").fetchall()
+
+
+def rekap_konsisten(conn):
+    rekap = isi(conn, "rekap_bulanan", "bulan, nama")
+    conn.execute("BEGIN")
+    laporan.rebuild(conn)
+    seharusnya = isi(conn, "rekap_bulanan", "bulan, nama")
+    conn.rollback()
+    return rekap == seharusnya
+
+
+def test_impor_gagal_di_tengah_tetap_memperbarui_ringkasan(karyawan, monkeypatch):
+    monkeypatch.setattr(jobs, "UKURAN_BATCH", 200)
+    gagal_pada_panggilan(monkeypatch, "save_absensi", 3)
+
+    job = impor(csv_bulan(1), ganti=False)
+
+    assert job["status"] == jobs.STATUS_GAGAL
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM absensi").fetchone()[0] == 400
+        assert ringkasan.cek(conn) == []
+        assert conn.execute("SELECT COUNT(*) FROM rekap_bulanan WHERE bulan = ?",
+                            (f"{TAHUN}-{BULAN:02d}",)).fetchone()[0] > 0
+        assert rekap_konsisten(conn)
+
+
+def test_ganti_bulan_gagal_tidak_mengubah_data_lama(karyawan, monkeypatch):
+    monkeypatch.setattr(jobs, "UKURAN_BATCH", 200)
+    assert impor(csv_bulan(1), ganti=True)["status"] == jobs.STATUS_SELESAI
+    with repo.koneksi() as conn:
+        sebelum = [isi(conn, t, "1") for t in ("absensi", "daily_summary", "rekap_bulanan")]
+
+    gagal_pada_panggilan(monkeypatch, "simpan_staging", 3)
+    job = impor(csv_bulan(2), ganti=True)
+
+    assert job["status"] == jobs.STATUS_GAGAL
+    with repo.koneksi() as conn:
+        assert [isi(conn, t, "1") for t in ("absensi", "daily_summary", "rekap_bulanan")] == sebelum
+        assert conn.execute("SELECT COUNT(*) FROM impor_staging").fetchone()[0] == 0
+
+
+def test_ganti_bulan_mengganti_seluruh_bulan(karyawan, monkeypatch):
+    monkeypatch.setattr(jobs, "UKURAN_BATCH", 200)
+    assert impor(csv_bulan(1), ganti=True)["status"] == jobs.STATUS_SELESAI
+    # File kedua hanya berisi separuh karyawan: sisanya harus hilang dari bulan itu.
+    separuh = buat_workbook(KARYAWAN // 2, hari=31, seed=3).to_csv(index=False).encode("utf-8")
+    job = impor(separuh, ganti=True)
+
+    assert job["status"] == jobs.STATUS_SELESAI
+    with repo.koneksi() as conn:
+        assert conn.execute("SELECT COUNT(DISTINCT nama) FROM absensi").fetchone()[0] == KARYAWAN // 2
+        assert conn.execute("SELECT COUNT(*) FROM impor_staging").fetchone()[0] == 0
+        assert ringkasan.cek(conn) == []
+        assert rekap_konsisten(conn)
+
+
+# --- Lease Job ---
+
+@pytest.fixture
+def job_lambat(db, monkeypatch):
+    # Handler yang menunggu sampai dilepas test, lalu melapor sekali.
+    mulai, lepas = threading.Event(), threading.Event()
+
+    def lambat(job_id, p, data, sudah, lapor):
+        mulai.set()
+        lepas.wait(10)
+        lapor(1, 1)
+        return "selesai"
+    monkeypatch.setitem(jobs._handler, "lambat", lambat)
+    monkeypatch.setattr(jobs, "BATAS_MACET", 1)
+    monkeypatch.setattr(jobs, "JEDA_DETAK", 0.2)
+    job_id = jobs.kirim("lambat", {})
+    hasil = []
+    t = threading.Thread(target=lambda: hasil.append(jobs.jalankan(job_id)))
+    t.start()
+    assert mulai.wait(10)
+    yield job_id, lepas, t, hasil
+    lepas.set()
+    t.join(10)
+
+
+def test_job_berjalan_tidak_diklaim_ulang_selama_ada_detak(job_lambat):
+    job_id, lepas, t, hasil = job_lambat
+    # Lebih lama dari BATAS_MACET: tanpa detak job ini sudah dianggap macet.
+    threading.Event().wait(2.5)
+    assert jobs._klaim() is None
+    lepas.set()
+    t.join(10)
+    assert hasil == [True]
+    assert jobs.ambil(job_id)["status"] == jobs.STATUS_SELESAI
+
+
+def test_worker_yang_kehilangan_job_berhenti_tanpa_menulis(job_lambat):
+    job_id, lepas, t, hasil = job_lambat
+    with repo.transaksi() as conn:
+        conn.execute("UPDATE jobs SET pemilik = 'worker lain' WHERE id = ?", (job_id,))
+    lepas.set()
+    t.join(10)
+    assert hasil == [False]
+    job = jobs.ambil(job_id)
+    assert job["status"] == jobs.STATUS_BERJALAN
+    assert job["progres"] == 0
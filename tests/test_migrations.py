@@ -0,0 +1,92 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import akun
+import laporan
+import migrations
+import ringkasan
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- Migrasi absensi.db Bawaan ---
+# absensi.db di repo masih versi 0 (skema aplikasi lama). Disalin dulu agar
+# file aslinya tidak ikut berubah.
+
+
+@pytest.fixture
+def db_lama(tmp_path):
+    path = tmp_path / "absensi.db"
+    shutil.copyfile(os.path.join(ROOT, "absensi.db"), path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def isi_tabel(conn, tabel, urut):
+    return conn.execute(f"SELECT * FROM {tabel} ORDER BY {urut}").fetchall()
+
+
+def test_migrasi_absensi_db_ke_versi_terbaru(db_lama):
+    assert migrations.schema_version(db_lama) == 0
+    jumlah_izin = db_lama.execute("SELECT COUNT(*) FROM izin").fetchone()[0]
+    # Migrasi 5 membuang duplikat (nama, tanggal).
+    jumlah_absensi = db_lama.execute("SELECT COUNT(*) FROM (SELECT DISTINCT nama, tanggal FROM absensi)").fetchone()[0]
+
+    migrations.migrate(db_lama)
+
+    assert migrations.schema_version(db_lama) == len(migrations.MIGRATIONS)
+    assert db_lama.execute("SELECT COUNT(*) FROM izin").fetchone()[0] == jumlah_izin
+    assert db_lama.execute("SELECT COUNT(*) FROM absensi").fetchone()[0] == jumlah_absensi
+    assert db_lama.execute("SELECT COUNT(*) FROM izin WHERE tanggal_selesai IS NULL "
+                           "AND tanggal_izin IS NOT NULL").fetchone()[0] == 0
+    assert db_lama.execute("SELECT COUNT(*) FROM izin WHERE file_persetujuan IS NOT NULL").fetchone()[0] == 0
+
+    # Tabel turunan sama dengan hasil hitung ulang kode saat ini.
+    assert ringkasan.cek(db_lama) == []
+    rekap = isi_tabel(db_lama, "rekap_bulanan", "bulan, nama")
+    laporan.rebuild(db_lama)
+    assert isi_tabel(db_lama, "rekap_bulanan", "bulan, nama") == rekap
+    db_lama.rollback()
+
+    hash_admin = db_lama.execute("SELECT password_hash FROM users WHERE username = 'admin'").fetchone()[0]
+    assert akun.cek_password("admin123", hash_admin)
+
+
+def test_migrasi_kedua_kali_tidak_mengubah_apa_pun(db_lama):
+    migrations.migrate(db_lama)
+    sebelum = isi_tabel(db_lama, "absensi", "id")
+    migrations.migrate(db_lama)
+    assert migrations.schema_version(db_lama) == len(migrations.MIGRATIONS)
+    assert isi_tabel(db_lama, "absensi", "id") == sebelum
+
+
+def test_migrasi_database_baru(tmp_path):
+    conn = sqlite3.connect(tmp_path / "baru.db")
+    migrations.migrate(conn)
+    assert migrations.schema_version(conn) == len(migrations.MIGRATIONS)
+    tabel = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"izin", "absensi", "karyawan", "lampiran", "daily_summary", "versi_data",
+            "rekap_bulanan", "jobs", "users"} <= tabel
+    conn.close()
+
+
+def test_migrasi_15_membuang_duplikat_per_karyawan_id(tmp_path):
+    conn = sqlite3.connect(tmp_path / "v14.db")
+    for migrasi in migrations.MIGRATIONS[:14]:
+        migrasi(conn)
+    conn.execute("PRAGMA user_version = 14")
+    conn.execute("INSERT INTO karyawan (ID, Nama, Divisi) VALUES (5, 'Karyawan 5', 'A')")
+    conn.executemany("INSERT INTO absensi (nama, divisi, tanggal, jam_masuk, status, karyawan_id) "
+                     "VALUES (?, 'A', '2024-08-01', '08:00', ?, 5)", [("KARYAWAN 5", "Tepat Waktu"),
+                                                                      ("Karyawan  5", "Telat")])
+    conn.commit()
+
+    migrations.migrate(conn)
+
+    assert conn.execute("SELECT nama, status FROM absensi").fetchall() == [("Karyawan  5", "Telat")]
+    assert conn.execute("SELECT karyawan_id, nama, hari_hadir FROM rekap_bulanan").fetchall() == [(5, "Karyawan 5", 1)]
+    assert ringkasan.cek(conn) == []
+    conn.close()
@@ -0,0 +1,86 @@
+import io
+from datetime import time
+
+import pandas as pd
+import pytest
+
+import presensi
+from benchmarks.bench_impor import buat_workbook
+
+# --- Impor Streaming vs Impor Biasa ---
+# Mode streaming harus menghasilkan baris absensi yang sama persis dengan
+# format_presensi_data pada seluruh sheet, termasuk saat satu ID terpotong di
+# batas chunk.
+
+MAPPING = {i: f"Divisi {i % 3}" for i in range(1, 40)}
+
+
+def sheet_uji():
+    df = buat_workbook(50, hari=31, seed=7)
+    # Nilai yang tidak rapi: jam tidak terbaca, jam dengan detik, spasi,
+    # datetime.time, dan ID yang tidak ada di tabel karyawan (ID > 39).
+    df[3] = df[3].astype(object)
+    df.loc[0, 3] = "jam 8"
+    df.loc[2, 3] = "08:05:30"
+    df.loc[4, 3] = " 09:20 "
+    df.loc[6, 3] = time(9, 17)
+    df.loc[8, 3] = None
+    return df
+
+
+def baris_biasa(df):
+    return presensi.ke_baris_absensi(presensi.format_presensi_data(df, MAPPING), 2024, 8)
+
+
+def urut(rows):
+    return sorted(rows, key=repr)
+
+
+@pytest.mark.parametrize("ukuran", [1, 7, 33, presensi.UKURAN_CHUNK])
+def test_streaming_xlsx_sama_dengan_biasa(ukuran):
+    buf = io.BytesIO()
+    sheet_uji().to_excel(buf, index=False)
+    data = buf.getvalue()
+
+    biasa = baris_biasa(pd.read_excel(io.BytesIO(data)))
+    stream = list(presensi.stream_presensi(presensi.chunk_xlsx(io.BytesIO(data), ukuran), MAPPING, 2024, 8))
+    assert len(biasa) > 0
+    assert urut(stream) == urut(biasa)
+
+
+@pytest.mark.parametrize("ukuran", [1, 7, 33, presensi.UKURAN_CHUNK])
+def test_streaming_csv_sama_dengan_biasa(ukuran):
+    data = sheet_uji().to_csv(index=False).encode("utf-8")
+
+    biasa = baris_biasa(pd.read_csv(io.BytesIO(data)))
+    stream = list(presensi.stream_presensi(presensi.chunk_csv(io.BytesIO(data), ukuran), MAPPING, 2024, 8))
+    assert len(biasa) > 0
+    assert urut(stream) == urut(biasa)
+
+
+def test_streaming_kolom_hilang():
+    data = sheet_uji().drop(columns=["Jenis"]).to_csv(index=False).encode("utf-8")
+    with pytest.raises(ValueError, match="Jenis"):
+        list(presensi.stream_presensi(presensi.chunk_csv(io.BytesIO(data)), MAPPING, 2024, 8))
+
+
+def sheet_per_jenis():
+    # Semua baris Datang dulu, baru semua baris Pulang.
+    df = sheet_uji()
+    return pd.concat([df[df["Jenis"] == "Datang"], df[df["Jenis"] == "Pulang"]], ignore_index=True)
+
+
+@pytest.mark.parametrize("ukuran", [1, 7, 33])
+def test_streaming_id_tidak_berurutan_ditolak(ukuran):
+    data = sheet_per_jenis().to_csv(index=False).encode("utf-8")
+    with pytest.raises(ValueError, match="tidak berurutan"):
+        list(presensi.stream_presensi(presensi.chunk_csv(io.BytesIO(data), ukuran), MAPPING, 2024, 8))
+
+
+def test_streaming_id_tidak_berurutan_dalam_satu_potongan():
+    # Selama seluruh file muat dalam satu potongan, urutan baris tidak masalah.
+    data = sheet_per_jenis().to_csv(index=False).encode("utf-8")
+    stream = list(presensi.stream_presensi(presensi.chunk_csv(io.BytesIO(data)), MAPPING, 2024, 8))
+    assert urut(stream) == urut(baris_biasa(pd.read_csv(io.BytesIO(data))))
+    # Satu baris per karyawan per hari, tidak terpecah Datang/Pulang.
+    assert len(stream) == len({(r[0], r[2]) for r in stream})